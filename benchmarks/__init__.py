@@ -0,0 +1,10 @@
+"""
+Benchmarks for the SciNote API client.
+
+Run from the repository root, e.g.:
+
+    python3 -m benchmarks.bench_codecs
+
+`python3 -m benchmarks.suite` runs all of them against the local mock server
+and compares the results with a stored baseline.
+"""
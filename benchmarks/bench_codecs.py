@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: JSON codecs on SciNote JSON:API payloads.
+
+Compares encoding and decoding speed of every installed codec
+(json, ujson, orjson) on representative responses and request bodies.
+
+Usage:
+    python3 -m benchmarks.bench_codecs [--repeat 200]
+"""
+
+import argparse
+
+from scinote_api import JSON_CODECS
+from benchmarks.common import best_time, metric
+from benchmarks.payloads import PAYLOADS, task_page
+
+
+def installed_codecs():
+    """Return the codecs that can be used in this Python environment."""
+    codecs = []
+    for codec_class in JSON_CODECS.values():
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            continue
+    return codecs
+
+
+def run(repeat=200):
+    """
+    Benchmark all installed codecs.
+
+    Returns:
+        list: One dict per (payload, codec) with encode/decode times in microseconds.
+    """
+    codecs = installed_codecs()
+    results = []
+    for payload_name, make_payload in PAYLOADS.items():
+        payload = make_payload()
+        encoded = JSON_CODECS['json']().dumps(payload)
+        for codec in codecs:
+            results.append({
+                'payload': payload_name,
+                'bytes': len(encoded),
+                'codec': codec.name,
+                'encode_us': best_time(lambda: codec.dumps(payload), repeat) * 1e6,
+                'decode_us': best_time(lambda: codec.loads(encoded), repeat) * 1e6,
+            })
+    return results
+
+
+def decode_cost(resources=1000, repeat=20):
+    """
+    Time to decode a list response per 1000 resources, for every installed codec.
+
+    Returns:
+        dict: Metrics decode.<codec>.ms_per_1k
+    """
+    encoded = JSON_CODECS['json']().dumps(task_page(resources))
+    return {
+        f'decode.{codec.name}.ms_per_1k': metric(
+            best_time(lambda: codec.loads(encoded), repeat) * 1e3 * 1000 / resources,
+            'ms', 'lower')
+        for codec in installed_codecs()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200, help='Runs per measurement')
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(f"\n{'Payload':<24}{'Size':>10}  {'Codec':<8}{'Encode µs':>12}{'Decode µs':>12}")
+    print('-' * 68)
+    for r in results:
+        print(f"{r['payload']:<24}{r['bytes']:>10}  {r['codec']:<8}"
+              f"{r['encode_us']:>12.1f}{r['decode_us']:>12.1f}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: end-to-end time of export_project_data.py by project size.
+
+Runs templates/08_advanced/export_project_data.py unchanged against the
+local mock server, with projects of increasing size, and measures the wall
+time of the whole script (including Python start-up).
+
+Usage:
+    python3 -m benchmarks.bench_export [--sizes 2x10 5x20 10x50] [--latency 0.01]
+
+Sizes are experiments x tasks per experiment.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import REPOSITORY, metric, mock_server
+
+TEMPLATE = REPOSITORY / 'templates' / '08_advanced' / 'export_project_data.py'
+
+
+def export(directory):
+    """Run the export template in `directory`. Returns (seconds, exported task count)."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, str(TEMPLATE)], cwd=directory, check=True,
+                   stdout=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - started
+    with open(Path(directory) / 'project_export.json', encoding='utf-8') as f:
+        exported = json.load(f)
+    return elapsed, sum(len(experiment['tasks']) for experiment in exported['experiments'])
+
+
+def run(sizes=((2, 10), (5, 20), (10, 50)), latency=0.01):
+    """
+    Measure the export of projects with the given sizes.
+
+    Args:
+        sizes: (experiments, tasks per experiment) of each project
+        latency (float): Simulated server latency in seconds
+
+    Returns:
+        dict: Metrics export.<experiments>x<tasks>.seconds and .tasks (exported tasks)
+    """
+    results = {}
+    for experiments, tasks in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            with mock_server('--projects', 1, '--experiments', experiments, '--tasks', tasks,
+                             '--latency', latency, directory=directory):
+                elapsed, exported = export(directory)
+        name = f'export.{experiments}x{tasks}'
+        results[f'{name}.seconds'] = metric(elapsed, 's', 'lower')
+        results[f'{name}.tasks'] = metric(exported, 'tasks', 'higher')
+    return results
+
+
+def _size(text):
+    experiments, _, tasks = text.partition('x')
+    return int(experiments), int(tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=_size, nargs='+', default=[(2, 10), (5, 20), (10, 50)],
+                        help='Project sizes as EXPERIMENTSxTASKS')
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help='Simulated server latency in seconds')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.latency)
+    print(f"\n{'Project':<12}{'Tasks':>8}{'Exported':>10}{'Seconds':>10}")
+    print('-' * 40)
+    for experiments, tasks in args.sizes:
+        name = f'export.{experiments}x{tasks}'
+        print(f"{experiments}x{tasks:<10}{experiments * tasks:>8}"
+              f"{results[f'{name}.tasks']['value']:>10}"
+              f"{results[f'{name}.seconds']['value']:>10.2f}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
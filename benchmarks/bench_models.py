@@ -0,0 +1,98 @@
+"""
+Benchmark: compact resource objects versus plain dicts.
+
+Decodes many task resources and compares the memory they take when kept as
+the parsed JSON dicts with the memory of scinote_models.Task objects, and
+the time to read attributes from both.
+
+Usage:
+    python3 -m benchmarks.bench_models [--count 20000]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from scinote_models import Task, _parse_timestamp
+from benchmarks.common import best_time
+from benchmarks.payloads import task_page
+
+
+def decoded_tasks(count):
+    """Decode `count` task resources from JSON, like api_request() does."""
+    page = json.dumps(task_page(100))
+    tasks = []
+    while len(tasks) < count:
+        tasks.extend(json.loads(page)['data'])
+    return tasks[:count]
+
+
+def measure_memory(build):
+    """Return (result, bytes allocated by build() that are still in use)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def first_read_time(dicts, repeat=3):
+    """Best time of the first created_at read of fresh objects (parses the timestamp)."""
+    best = float('inf')
+    for _ in range(repeat):
+        objects = [Task.from_json(d) for d in dicts]
+        best = min(best, best_time(lambda: [o.created_at for o in objects], repeat=1))
+    return best
+
+
+def run(count=20000):
+    """
+    Compare dicts and Task objects.
+
+    Returns:
+        dict: Memory (bytes) and attribute access times (seconds) for both.
+    """
+    dicts, dict_memory = measure_memory(lambda: decoded_tasks(count))
+    del dicts
+    objects, object_memory = measure_memory(
+        lambda: [Task.from_json(task) for task in decoded_tasks(count)])
+    dicts = decoded_tasks(count)
+
+    return {
+        'count': count,
+        'dict_bytes': dict_memory,
+        'object_bytes': object_memory,
+        'dict_access_s': best_time(lambda: [d['attributes'].get('name') for d in dicts]),
+        'object_access_s': best_time(lambda: [o.name for o in objects]),
+        # Both read a datetime: dicts parse the string on every read, objects on the first
+        'dict_timestamp_s': best_time(
+            lambda: [_parse_timestamp(d['attributes'].get('created_at')) for d in dicts]),
+        'object_timestamp_first_s': first_read_time(dicts),
+        'object_timestamp_s': best_time(lambda: [o.created_at for o in objects]),
+        'convert_s': best_time(lambda: [Task.from_json(d) for d in dicts], repeat=3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=20000, help='Number of tasks')
+    args = parser.parse_args()
+
+    r = run(args.count)
+    print(f"\n{r['count']} tasks")
+    print(f"  Memory      dicts: {r['dict_bytes'] / 1e6:8.1f} MB   "
+          f"objects: {r['object_bytes'] / 1e6:8.1f} MB   "
+          f"({r['dict_bytes'] / r['object_bytes']:.1f}x smaller)")
+    print(f"  Read name   dicts: {r['dict_access_s'] * 1e3:8.2f} ms   "
+          f"objects: {r['object_access_s'] * 1e3:8.2f} ms")
+    print(f"  Read date   dicts: {r['dict_timestamp_s'] * 1e3:8.2f} ms   "
+          f"objects: {r['object_timestamp_first_s'] * 1e3:8.2f} ms first read, "
+          f"{r['object_timestamp_s'] * 1e3:.2f} ms later (both parsed to datetime)")
+    print(f"  Conversion  {r['convert_s'] * 1e3:.2f} ms for all tasks\n")
+
+
+if __name__ == '__main__':
+    main()
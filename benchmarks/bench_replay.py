@@ -0,0 +1,77 @@
+"""
+Benchmark: recording and replaying a cassette.
+
+Lists all tasks of an experiment against the local mock server - once with
+buffered pages and once streamed (iter_resources(stream=True)) - while
+recording them to a cassette, then replays the cassette without the server
+as fast as possible. The replayed resources must match the recorded ones.
+
+Usage:
+    python3 -m benchmarks.bench_replay [--tasks 500]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from scinote_api import SciNoteSession
+from scinote_cassette import RecordingTransport, replay_session
+from benchmarks.common import metric, mock_server
+
+ENDPOINT = '/api/v1/teams/1/projects/1/experiments/1/tasks'
+
+
+def list_tasks(session):
+    """Task IDs from a buffered and a streamed listing."""
+    buffered = [task['id'] for task in session.iter_resources(ENDPOINT)]
+    streamed = [task['id'] for task in session.iter_resources(ENDPOINT, stream=True)]
+    return buffered, streamed
+
+
+def run(tasks=500):
+    """
+    Record and replay the listings.
+
+    Returns:
+        dict: Metrics replay.record_s and replay.replay_s
+
+    Raises:
+        AssertionError: If the replayed listings differ from the recorded ones
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        cassette = Path(directory) / 'tasks.cassette'
+        with mock_server('--projects', 1, '--experiments', 1, '--tasks', tasks) as cred_file:
+            session = SciNoteSession(cred_file, transport=RecordingTransport(cassette))
+            started = time.perf_counter()
+            recorded = list_tasks(session)
+            record_s = time.perf_counter() - started
+            session.close()
+
+        session = replay_session(cassette, timing='fast')
+        started = time.perf_counter()
+        replayed = list_tasks(session)
+        replay_s = time.perf_counter() - started
+        session.close()
+
+    assert recorded == replayed, "Replayed listings differ from the recorded ones"
+    assert len(recorded[1]) == tasks, f"Streamed {len(recorded[1])} of {tasks} tasks"
+    return {
+        'replay.record_s': metric(record_s, 's', 'lower'),
+        'replay.replay_s': metric(replay_s, 's', 'lower'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=500, help='Tasks in the listing')
+    args = parser.parse_args()
+
+    results = run(args.tasks)
+    print(f"\n✓ Replayed {args.tasks} tasks (buffered and streamed) identically")
+    print(f"  Record: {results['replay.record_s']['value']:.2f}s   "
+          f"Replay: {results['replay.replay_s']['value']:.2f}s\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: request throughput and latency against the local mock server.
+
+Sends the same GET request many times in four ways and reports requests
+per second and latency percentiles for each:
+
+    serial    one request at a time, new connection each (UrllibTransport)
+    pooled    one request at a time over reused connections (PooledTransport)
+    threaded  parallel requests from a thread pool sharing one session
+    async     parallel requests with the asyncio client
+
+Usage:
+    python3 -m benchmarks.bench_requests [--requests 500] [--workers 16] [--latency 0.01]
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scinote_api import PooledTransport, SciNoteSession, UrllibTransport
+from scinote_async import AsyncSciNoteClient
+from benchmarks.common import metric, mock_server, percentile
+
+ENDPOINT = '/api/v1/teams/1/projects/1'
+
+
+def _timed(session, latencies):
+    started = time.perf_counter()
+    session.request('GET', ENDPOINT)
+    latencies.append(time.perf_counter() - started)
+
+
+def _serial(cred_file, requests, workers):
+    session = SciNoteSession(cred_file, transport=UrllibTransport())
+    latencies = []
+    for _ in range(requests):
+        _timed(session, latencies)
+    return latencies
+
+
+def _pooled(cred_file, requests, workers):
+    session = SciNoteSession(cred_file)
+    latencies = []
+    for _ in range(requests):
+        _timed(session, latencies)
+    session.close()
+    return latencies
+
+
+def _threaded(cred_file, requests, workers):
+    session = SciNoteSession(cred_file,
+                             transport=PooledTransport(max_connections_per_host=workers))
+    latencies = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda _: _timed(session, latencies), range(requests)))
+    session.close()
+    return latencies
+
+
+def _async(cred_file, requests, workers):
+    latencies = []
+
+    async def worker(client, count):
+        # Like a thread pool worker: one request after another
+        for _ in range(count):
+            started = time.perf_counter()
+            await client.request('GET', ENDPOINT)
+            latencies.append(time.perf_counter() - started)
+
+    async def main():
+        session = SciNoteSession(cred_file)
+        async with AsyncSciNoteClient(session=session, max_concurrency=workers,
+                                      max_connections_per_host=workers) as client:
+            counts = [requests // workers + (i < requests % workers) for i in range(workers)]
+            await asyncio.gather(*(worker(client, count) for count in counts))
+
+    asyncio.run(main())
+    return latencies
+
+
+MODES = {'serial': _serial, 'pooled': _pooled, 'threaded': _threaded, 'async': _async}
+
+
+def run(requests=500, workers=16, latency=0.01, cred_file=None):
+    """
+    Measure every mode.
+
+    Args:
+        requests (int): Requests per mode
+        workers (int): Parallel requests in the threaded and async modes
+        latency (float): Simulated server latency in seconds
+        cred_file (Path, optional): Use an already running server instead
+            of starting the mock server
+
+    Returns:
+        dict: Metrics named requests.<mode>.rps / .p50_ms / .p99_ms
+    """
+    if cred_file is None:
+        with mock_server('--latency', latency) as cred_file:
+            return run(requests, workers, latency, cred_file)
+
+    SciNoteSession(cred_file).request('GET', ENDPOINT)   # Warm up the server
+    results = {}
+    for mode, function in MODES.items():
+        started = time.perf_counter()
+        latencies = function(cred_file, requests, workers)
+        elapsed = time.perf_counter() - started
+        results[f'requests.{mode}.rps'] = metric(requests / elapsed, 'req/s', 'higher')
+        results[f'requests.{mode}.p50_ms'] = metric(percentile(latencies, 50) * 1e3, 'ms',
+                                                    'lower')
+        results[f'requests.{mode}.p99_ms'] = metric(percentile(latencies, 99) * 1e3, 'ms',
+                                                    'lower')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500, help='Requests per mode')
+    parser.add_argument('--workers', type=int, default=16, help='Parallel requests')
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help='Simulated server latency in seconds')
+    args = parser.parse_args()
+
+    results = run(args.requests, args.workers, args.latency)
+    print(f"\n{'Mode':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    print('-' * 40)
+    for mode in MODES:
+        print(f"{mode:<10}{results[f'requests.{mode}.rps']['value']:>10.0f}"
+              f"{results[f'requests.{mode}.p50_ms']['value']:>10.1f}"
+              f"{results[f'requests.{mode}.p99_ms']['value']:>10.1f}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: memory used by file uploads.
+
+Uploads files of increasing size the way upload_file_result.py does (read
+the file, encode it as Base64, send it as JSON) to the local mock server
+and records the peak memory allocated by Python during each upload.
+
+Usage:
+    python3 -m benchmarks.bench_upload [--sizes 1 4 16]
+"""
+
+import argparse
+import base64
+import os
+import tempfile
+import tracemalloc
+
+from scinote_api import SciNoteSession
+from benchmarks.common import metric, mock_server
+
+ENDPOINT = '/api/v1/teams/1/projects/1/experiments/1/tasks/1/results'
+
+
+def upload(session, path):
+    """Upload a file as a result, like templates/06_results/upload_file_result.py."""
+    with open(path, 'rb') as f:
+        file_content = f.read()
+        b64_content = base64.b64encode(file_content).decode('ascii')
+
+    request_data = {
+        'data': {'type': 'results', 'attributes': {'name': 'Benchmark upload'}},
+        'included': [{
+            'type': 'result_files',
+            'attributes': {
+                'file_name': os.path.basename(path),
+                'file_type': 'application/octet-stream',
+                'file_data': b64_content,
+            },
+        }],
+    }
+    return session.request('POST', ENDPOINT, json_data=request_data)
+
+
+def run(sizes_mb=(1, 4, 16), cred_file=None):
+    """
+    Measure the peak memory of uploads.
+
+    Returns:
+        dict: Metrics upload.<size>mb.peak_mb and upload.<size>mb.peak_ratio
+            (peak memory divided by file size)
+    """
+    if cred_file is None:
+        with mock_server() as cred_file:
+            return run(sizes_mb, cred_file)
+
+    session = SciNoteSession(cred_file)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size_mb in sizes_mb:
+            path = os.path.join(directory, f'upload_{size_mb}mb.bin')
+            with open(path, 'wb') as f:
+                f.write(os.urandom(size_mb * 1024 * 1024))
+
+            tracemalloc.start()
+            upload(session, path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results[f'upload.{size_mb}mb.peak_mb'] = metric(peak / 1024 ** 2, 'MB', 'lower')
+            results[f'upload.{size_mb}mb.peak_ratio'] = metric(
+                peak / (size_mb * 1024 ** 2), 'x file size', 'lower')
+    session.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 4, 16],
+                        help='File sizes in MB')
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    print(f"\n{'File':>8}{'Peak memory':>14}{'Ratio':>8}")
+    print('-' * 30)
+    for size_mb in args.sizes:
+        print(f"{size_mb:>6}MB{results[f'upload.{size_mb}mb.peak_mb']['value']:>12.1f}MB"
+              f"{results[f'upload.{size_mb}mb.peak_ratio']['value']:>7.1f}x")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Helpers shared by the benchmarks: the local mock server and result records.
+"""
+
+import math
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+
+def metric(value, unit, better):
+    """A benchmark result; `better` is 'higher' or 'lower'."""
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def percentile(values, q):
+    """The q-th percentile (0-100) of a list of numbers (nearest rank)."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def best_time(function, repeat=5):
+    """Best wall time in seconds of `repeat` calls (least disturbed by noise)."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def mock_server(*options, directory=None):
+    """
+    Run scinote_mock_server.py in a separate process.
+
+    The server runs in its own process, so it doesn't compete with the
+    client for the GIL.
+
+    Args:
+        *options: Command line options, e.g. '--latency', '0.01'
+        directory (str, optional): Directory for the credential file.
+            Defaults to a temporary directory.
+
+    Yields:
+        Path: Credential file for the server
+    """
+    with tempfile.TemporaryDirectory() as temporary:
+        cred_file = Path(directory or temporary) / 'api_credentials_mock.json'
+        port = _free_port()
+        process = subprocess.Popen(
+            [sys.executable, str(REPOSITORY / 'scinote_mock_server.py'), '--port', str(port),
+             '--credentials', str(cred_file), *map(str, options)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            deadline = time.monotonic() + 60
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Mock server failed to start:\n"
+                                       f"{process.stderr.read().decode()}")
+                try:
+                    socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                    if cred_file.exists():
+                        break
+                except OSError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("Mock server did not start within 60 seconds")
+                time.sleep(0.05)
+            yield cred_file
+        finally:
+            process.terminate()
+            process.wait()
+            cred_file.unlink(missing_ok=True)
@@ -0,0 +1,155 @@
+"""
+Synthetic SciNote JSON:API payloads for benchmarks.
+
+The documents mimic real API responses: list pages with links, attributes
+of typical sizes and an `included` block for compound documents.
+"""
+
+import random
+
+SERVER_URL = 'https://scinote.example.org'
+
+
+def _timestamp(rng):
+    return (f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            f"T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00.000Z")
+
+
+def _links(endpoint, page, page_size, total):
+    last = max(1, (total + page_size - 1) // page_size)
+
+    def link(number):
+        return f'{SERVER_URL}{endpoint}?page%5Bnumber%5D={number}&page%5Bsize%5D={page_size}'
+
+    return {
+        'self': link(page),
+        'first': link(1),
+        'prev': link(page - 1) if page > 1 else None,
+        'next': link(page + 1) if page < last else None,
+        'last': link(last),
+    }
+
+
+def task_page(count=100, seed=1):
+    """A page of tasks (my_modules) as returned by .../experiments/{id}/tasks."""
+    rng = random.Random(seed)
+    return {
+        'data': [
+            {
+                'id': str(1000 + i),
+                'type': 'tasks',
+                'attributes': {
+                    'name': f'Task {i} - sample preparation',
+                    'description': 'Prepare samples according to SOP. ' * rng.randint(1, 4),
+                    'state': rng.choice(['uncompleted', 'in_progress', 'completed']),
+                    'status_name': rng.choice(['Not started', 'In progress', 'Completed']),
+                    'archived': False,
+                    'started_on': _timestamp(rng),
+                    'completed_on': None,
+                    'due_date': _timestamp(rng),
+                    'created_at': _timestamp(rng),
+                    'updated_at': _timestamp(rng),
+                    'x': rng.randint(0, 2000),
+                    'y': rng.randint(0, 2000),
+                },
+                'relationships': {
+                    'experiment': {'data': {'id': '12', 'type': 'experiments'}},
+                },
+            }
+            for i in range(count)
+        ],
+        'links': _links('/api/v1/teams/1/projects/5/experiments/12/tasks', 1, count, count * 20),
+    }
+
+
+def inventory_item_page(count=100, columns=20, seed=2):
+    """A page of inventory items with custom column cells in `included`."""
+    rng = random.Random(seed)
+    data = []
+    included = []
+    for i in range(count):
+        item_id = str(5000 + i)
+        cell_refs = []
+        for column in range(columns):
+            cell_id = f'{item_id}-{column}'
+            cell_refs.append({'id': cell_id, 'type': 'inventory_cells'})
+            included.append({
+                'id': cell_id,
+                'type': 'inventory_cells',
+                'attributes': {
+                    'value_type': 'RepositoryTextValue',
+                    'value': f'value {rng.random():.6f}',
+                    'column_id': column + 1,
+                    'created_at': _timestamp(rng),
+                    'updated_at': _timestamp(rng),
+                },
+            })
+        data.append({
+            'id': item_id,
+            'type': 'inventory_items',
+            'attributes': {
+                'name': f'Plasmid pUC19-{i}',
+                'archived': False,
+                'created_at': _timestamp(rng),
+                'updated_at': _timestamp(rng),
+            },
+            'relationships': {'inventory_cells': {'data': cell_refs}},
+        })
+    return {
+        'data': data,
+        'included': included,
+        'links': _links('/api/v1/teams/1/inventories/3/items', 1, count, count * 50),
+    }
+
+
+def table_result(rows=200, cols=12, seed=3):
+    """A table result request body as created by create_table_result.py."""
+    rng = random.Random(seed)
+    table = [[f'{rng.uniform(0, 100):.4f}' for _ in range(cols)] for _ in range(rows)]
+    return {
+        'data': {'type': 'results', 'attributes': {'name': 'Plate reader OD600'}},
+        'included': [{
+            'type': 'result_tables',
+            'attributes': {'contents': {'data': table}, 'name': 'OD600'},
+        }],
+    }
+
+
+def protocol_with_steps(steps=50, seed=4):
+    """A protocol fetched with ?include=protocol_steps."""
+    rng = random.Random(seed)
+    step_ids = [str(800 + i) for i in range(steps)]
+    rng.shuffle(step_ids)
+    return {
+        'data': {
+            'id': '77',
+            'type': 'protocols',
+            'attributes': {'name': 'Miniprep', 'description': 'Plasmid isolation',
+                           'version_number': 3},
+            'relationships': {
+                'protocol_steps': {'data': [{'id': step_id, 'type': 'protocol_steps'}
+                                            for step_id in step_ids]},
+            },
+        },
+        'included': [
+            {
+                'id': step_id,
+                'type': 'protocol_steps',
+                'attributes': {
+                    'name': f'Step {int(step_id) - 800}',
+                    'position': int(step_id) - 800,
+                    'description': 'Centrifuge at 13,000 rpm for 1 minute. ' * 3,
+                    'completed': False,
+                },
+            }
+            for step_id in step_ids
+        ],
+    }
+
+
+PAYLOADS = {
+    'task_page_100': task_page,
+    'inventory_page_100x20': inventory_item_page,
+    'table_result_200x12': table_result,
+    'protocol_50_steps': protocol_with_steps,
+}
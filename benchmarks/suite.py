@@ -0,0 +1,125 @@
+"""
+Benchmark suite: runs all client benchmarks and compares them with a baseline.
+
+Measures request throughput and latency (serial, pooled, threaded, async),
+JSON decode cost, upload memory, export time and cassette record/replay
+against the local mock server. Results are written as JSON; if a baseline
+file exists, every metric is compared with it and the run fails if one got
+worse by more than the threshold.
+
+Usage:
+    # Run everything, write bench_results.json and compare with the baseline
+    python3 -m benchmarks.suite
+
+    # Store the current results as the new baseline
+    python3 -m benchmarks.suite --save-baseline
+
+    # Only some groups, smaller workloads, 25% tolerance
+    python3 -m benchmarks.suite --only requests decode --quick --threshold 0.25
+
+Baselines depend on the machine, so none is shipped with the repository.
+The first run on a machine (without benchmarks/baseline.json) only records
+its results as the baseline; later runs compare against it.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from benchmarks import bench_codecs, bench_export, bench_replay, bench_requests, bench_upload
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+GROUPS = {
+    'requests': lambda quick: bench_requests.run(requests=200 if quick else 1000),
+    'decode': lambda quick: bench_codecs.decode_cost(repeat=5 if quick else 20),
+    'upload': lambda quick: bench_upload.run(sizes_mb=(1, 4) if quick else (1, 4, 16)),
+    'export': lambda quick: bench_export.run(
+        sizes=((2, 10), (5, 20)) if quick else ((2, 10), (5, 20), (10, 50))),
+    'replay': lambda quick: bench_replay.run(tasks=200 if quick else 500),
+}
+
+
+def run(groups=tuple(GROUPS), quick=False):
+    """Run benchmark groups and return the results document."""
+    metrics = {}
+    for group in groups:
+        print(f"Running {group} benchmarks...")
+        metrics.update(GROUPS[group](quick))
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'metrics': metrics,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline.
+
+    Returns:
+        list: (name, baseline value, current value, relative change, regressed)
+            for every metric present in both
+    """
+    rows = []
+    for name, current in results['metrics'].items():
+        previous = baseline['metrics'].get(name)
+        if previous is None or not previous['value']:
+            continue
+        change = (current['value'] - previous['value']) / previous['value']
+        worse = -change if current['better'] == 'higher' else change
+        rows.append((name, previous['value'], current['value'], change, worse > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', nargs='+', choices=list(GROUPS), default=list(GROUPS),
+                        help='Benchmark groups to run')
+    parser.add_argument('--quick', action='store_true', help='Smaller workloads')
+    parser.add_argument('--output', default='bench_results.json', help='Results file')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline file')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Allowed relative change for the worse (0.15 = 15%%)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Write the results to the baseline file')
+    args = parser.parse_args()
+
+    results = run(args.only, args.quick)
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"\n✓ Results written to {args.output}")
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2))
+        print(f"✓ Baseline saved to {args.baseline}")
+        return
+
+    if not Path(args.baseline).exists():
+        Path(args.baseline).write_text(json.dumps(results, indent=2))
+        print(f"\nNo baseline found at {args.baseline} - nothing was compared.")
+        print(f"✓ Recorded these results as the baseline for this machine")
+        print("→ Run the suite again to compare against it")
+        return
+
+    rows = compare(results, json.loads(Path(args.baseline).read_text()), args.threshold)
+    print(f"\n{'Metric':<36}{'Baseline':>12}{'Current':>12}{'Change':>9}")
+    print('-' * 72)
+    for name, previous, current, change, regressed in rows:
+        unit = results['metrics'][name]['unit']
+        marker = '  ✗ REGRESSION' if regressed else ''
+        print(f"{name:<36}{previous:>12.2f}{current:>12.2f}{change:>+9.1%}  {unit}{marker}")
+
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f"\n✗ {len(regressions)} metric(s) worse than the baseline by more than "
+              f"{args.threshold:.0%}")
+        sys.exit(1)
+    print(f"\n✓ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -16,16 +16,46 @@ Usage:
     project = api_request('POST', f'/api/v1/teams/{team_id}/projects',
                           json={'data': {'type': 'projects',
                                         'attributes': {'name': 'New Project'}}})
+
+Credentials are loaded once per process by a shared SciNoteSession and only
+re-read when the credential file changes. Create your own session to use a
+specific credential file:
+
+    from scinote_api import SciNoteSession, set_default_session
+
+    set_default_session(SciNoteSession('api_credentials_2025-12-03T102351.json'))
 """
 
+import asyncio
+import contextvars
+import io
 import json
+import random
 import time
 import glob
+import gzip
 import os
+import threading
+import ssl
+import stat
+import tempfile
+import zlib
+import http.client
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from urllib.request import Request, urlopen
+from urllib.parse import urljoin, urlsplit, parse_qs, quote, unquote
+from urllib.request import Request, getproxies, urlopen
 from urllib.error import HTTPError, URLError
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 
 # === Error Message Mappings ===
 
@@ -107,9 +137,14 @@ def _find_credential_file():
     return Path(latest_file)
 
 
-def _load_credentials():
-    """Load credentials from the most recent credential file."""
-    cred_file = _find_credential_file()
+def _load_credentials(cred_file=None):
+    """
+    Load credentials from a credential file.
+
+    Uses the most recent credential file if cred_file is not given.
+    """
+    if cred_file is None:
+        cred_file = _find_credential_file()
 
     try:
         with open(cred_file, 'r') as f:
@@ -132,22 +167,115 @@ def _load_credentials():
     return credentials, cred_file
 
 
-def _refresh_token_if_needed(credentials, cred_file):
+def _token_is_valid(credentials, margin=60):
+    """Check if the access token is valid for at least `margin` more seconds."""
+    token_created = credentials.get('access_token_created_at', 0)
+    token_expires_in = credentials.get('access_token_expires_in', 7200)
+    return token_created + token_expires_in > int(time.time()) + margin
+
+
+_refresh_thread_locks = {}
+_refresh_thread_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _credential_file_lock(cred_file):
     """
-    Check if access token has expired and refresh it if necessary.
+    Hold an exclusive lock while refreshing the tokens of a credential file.
 
-    Updates the credential file with new tokens if refreshed.
+    Threads of this process wait on a shared threading lock, other processes
+    on an advisory lock of a '.lock' file next to the credential file.
     """
-    # Check if token is expired (with 60 second buffer)
-    token_created = credentials.get('access_token_created_at', 0)
-    token_expires_in = credentials.get('access_token_expires_in', 7200)
+    path = str(Path(cred_file).resolve())
+    with _refresh_thread_locks_guard:
+        thread_lock = _refresh_thread_locks.setdefault(path, threading.Lock())
+
+    with thread_lock, open(path + '.lock', 'a+') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            # msvcrt.locking() gives up after 10 seconds - keep waiting
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _save_credentials(credentials, cred_file):
+    """
+    Write credentials to the credential file atomically.
+
+    The data is written to a temporary file first and then renamed, so other
+    scripts never see a half-written credential file. The file keeps its
+    permissions.
+    """
+    cred_dir = os.path.dirname(os.path.abspath(cred_file))
+    fd, tmp_path = tempfile.mkstemp(dir=cred_dir, prefix='.api_credentials_', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(credentials, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp() creates the file as 0600 - keep the mode of the existing file
+        if os.path.exists(cred_file):
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(cred_file).st_mode))
+        os.replace(tmp_path, cred_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _refresh_token_if_needed(credentials, cred_file, margin=60, on_refresh=None):
+    """
+    Check if access token has expired and refresh it if necessary.
 
-    if token_created + token_expires_in > int(time.time()) + 60:
-        # Token is still valid
+    The token counts as expired `margin` seconds before it actually expires.
+    Updates the credential file with new tokens if refreshed. When several
+    threads or scripts share a credential file, only one of them contacts
+    the server - the others wait and pick up the new tokens from the file.
+    `on_refresh(duration)` is called after this process renewed the token.
+    """
+    # Check if token is expired (with 60 second buffer by default)
+    if _token_is_valid(credentials, margin):
         return credentials
 
-    print("Access token expired, refreshing...")
+    with _credential_file_lock(cred_file):
+        # Another thread or script may have refreshed the token while we waited
+        latest_credentials, _ = _load_credentials(cred_file)
+        credentials.update(latest_credentials)
+        if _token_is_valid(credentials, margin):
+            return credentials
+
+        print("Access token expired, refreshing...")
+        started = time.monotonic()
+        token_data = _request_new_token(credentials)
+
+        # Update credentials with new tokens
+        credentials['access_token'] = token_data['access_token']
+        credentials['refresh_token'] = token_data['refresh_token']
+        credentials['access_token_created_at'] = token_data['created_at']
+        credentials['access_token_expires_in'] = token_data['expires_in']
+
+        # Save updated credentials back to file
+        _save_credentials(credentials, cred_file)
+
+    print("✓ Token refreshed successfully")
+    if on_refresh is not None:
+        on_refresh(time.monotonic() - started)
+    return credentials
+
 
+def _request_new_token(credentials):
+    """Exchange the refresh token for a new access token."""
     # Prepare refresh token request
     url = credentials['server_url'] + "/oauth/token"
     payload = json.dumps({
@@ -165,7 +293,7 @@ def _refresh_token_if_needed(credentials, cred_file):
 
     try:
         response = urlopen(request)
-        token_data = json.loads(response.read().decode())
+        return json.loads(response.read().decode())
     except HTTPError as e:
         error_body = e.read().decode() if e.fp else ''
         raise RuntimeError(
@@ -182,19 +310,6 @@ def _refresh_token_if_needed(credentials, cred_file):
             "→ Verify the server URL in your credentials file"
         )
 
-    # Update credentials with new tokens
-    credentials['access_token'] = token_data['access_token']
-    credentials['refresh_token'] = token_data['refresh_token']
-    credentials['access_token_created_at'] = token_data['created_at']
-    credentials['access_token_expires_in'] = token_data['expires_in']
-
-    # Save updated credentials back to file
-    with open(cred_file, 'w') as f:
-        json.dump(credentials, f, indent=2)
-
-    print("✓ Token refreshed successfully")
-    return credentials
-
 
 def _handle_api_error(error, endpoint, method):
     """Format HTTP errors with helpful guidance for users."""
@@ -248,6 +363,13 @@ def _handle_api_error(error, endpoint, method):
                 "  • Contact the team owner and ask them to make you a team administrator.\n"
                 "  • Team administrators have full access to all team resources via API."
             )
+    elif 300 <= error_code < 400:
+        guidance = (
+            f"Unexpected Redirect - The server points to another address: "
+            f"{error.headers.get('location', 'unknown')}\n"
+            "→ Check the server_url in your credential file (e.g. https:// instead of http://).\n"
+            "→ If you connect through a proxy, set the HTTPS_PROXY environment variable."
+        )
     else:
         guidance = HTTP_ERROR_GUIDANCE.get(error_code,
             f"HTTP {error_code} error occurred. Check the API documentation for details."
@@ -267,12 +389,1268 @@ def _handle_api_error(error, endpoint, method):
     raise RuntimeError(error_message)
 
 
+def _raise_connection_error(credentials, error):
+    """Raise a ConnectionError explaining that the server can't be reached."""
+    raise ConnectionError(
+        f"Cannot connect to SciNote server: {credentials['server_url']}\n"
+        f"Error: {error.reason}\n\n"
+        "→ Check your internet connection\n"
+        "→ Verify the server URL is correct"
+    )
+
+
+# === HTTP Transport ===
+
+class TransportResponse:
+    """
+    HTTP response returned by a transport.
+
+    Attributes:
+        status (int): HTTP status code
+        reason (str): HTTP reason phrase
+        headers (dict): Response headers with lower-case names
+        body (bytes): Raw response body (None for streamed responses)
+        stream: For requests sent with stream=True and a 2xx status, a
+            file-like object to read the body from. Close it when done.
+    """
+
+    def __init__(self, status, reason, headers, body, stream=None):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.stream = stream
+
+    def to_http_error(self, url):
+        """Wrap an error response in an HTTPError for _handle_api_error()."""
+        headers = http.client.HTTPMessage()
+        for name, value in self.headers.items():
+            headers[name] = value
+        return HTTPError(url, self.status, self.reason, headers, io.BytesIO(self.body))
+
+
+class UrllibTransport:
+    """
+    Sends every request with urllib's urlopen() (a new connection each time).
+
+    Slower than PooledTransport, but honours urllib features such as
+    proxy environment variables and redirects.
+    """
+
+    def send(self, method, url, body=None, headers=None, stream=False):
+        request = Request(url, data=body, headers=headers or {}, method=method)
+        try:
+            response = urlopen(request)
+        except HTTPError as e:
+            return TransportResponse(e.code, e.reason, _lower_headers(e.headers),
+                                     e.read() if e.fp else b'')
+        if stream and _is_streamable(response.status):
+            return TransportResponse(response.status, response.reason,
+                                     _lower_headers(response.headers), None, stream=response)
+        return TransportResponse(response.status, response.reason,
+                                 _lower_headers(response.headers), response.read())
+
+    def close(self):
+        pass
+
+
+class PooledTransport:
+    """
+    Sends requests over keep-alive connections that are reused between calls.
+
+    Opening a new connection (TCP + TLS handshake) often takes longer than the
+    API call itself, so idle connections are kept per host and reused.
+
+    Redirects of GET and HEAD requests are followed like urlopen() does.
+    Proxies are not supported - sessions use UrllibTransport instead when
+    proxy environment variables are set (see default_transport()).
+
+    Args:
+        max_connections_per_host (int): Maximum number of open connections
+            per host. Further requests wait until a connection is free.
+        idle_timeout (float): Seconds after which an unused connection is closed.
+        timeout (float, optional): Socket timeout in seconds.
+        max_redirects (int): Maximum number of redirects followed per request.
+    """
+
+    def __init__(self, max_connections_per_host=10, idle_timeout=30, timeout=None,
+                 max_redirects=10):
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self._idle = {}        # (scheme, host, port) -> [(connection, last_used), ...]
+        self._slots = {}       # (scheme, host, port) -> semaphore limiting open connections
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def _new_connection(self, scheme, host, port):
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout,
+                                               context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _acquire(self, key):
+        """Return (connection, reused) for a host, waiting for a free slot if needed."""
+        with self._lock:
+            slots = self._slots.setdefault(
+                key, threading.BoundedSemaphore(self.max_connections_per_host))
+        slots.acquire()
+
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            # Close connections that have been unused for too long
+            while idle and now - idle[0][1] > self.idle_timeout:
+                idle.pop(0)[0].close()
+            if idle:
+                return idle.pop()[0], True
+
+        try:
+            return self._new_connection(*key), False
+        except BaseException:
+            slots.release()
+            raise
+
+    def _release(self, key, connection, reusable):
+        if reusable:
+            with self._lock:
+                self._idle[key].append((connection, time.monotonic()))
+        else:
+            connection.close()
+        self._slots[key].release()
+
+    def send(self, method, url, body=None, headers=None, stream=False):
+        for _ in range(self.max_redirects):
+            response = self._send_once(method, url, body, headers, stream)
+            location = response.headers.get('location')
+            if (response.status not in _REDIRECT_STATUSES or not location
+                    or method.upper() not in ('GET', 'HEAD')):
+                return response
+            if response.stream is not None:
+                response.stream.close()
+
+            redirected = urljoin(url, location)
+            if urlsplit(redirected).netloc != urlsplit(url).netloc:
+                # Don't send the access token to another host
+                headers = {name: value for name, value in (headers or {}).items()
+                           if name.lower() != 'authorization'}
+            url = redirected
+        return self._send_once(method, url, body, headers, stream)
+
+    def _send_once(self, method, url, body, headers, stream):
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'https'
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == 'https' else 80))
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+        while True:
+            connection, reused = self._acquire(key)
+            try:
+                connection.request(method, path, body=body, headers=headers or {})
+                response = connection.getresponse()
+                if stream and _is_streamable(response.status):
+                    return TransportResponse(
+                        response.status, response.reason, _lower_headers(response.headers),
+                        None, stream=_PooledResponseStream(self, key, connection, response))
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                self._release(key, connection, reusable=False)
+                if reused:
+                    # The server closed an idle keep-alive connection - retry on a new one
+                    continue
+                raise URLError(e)
+            except (http.client.HTTPException, OSError) as e:
+                self._release(key, connection, reusable=False)
+                raise URLError(e)
+            except BaseException:
+                # Anything else (e.g. invalid headers, KeyboardInterrupt) - free the slot, too
+                self._release(key, connection, reusable=False)
+                raise
+
+            self._release(key, connection, reusable=not response.will_close)
+            return TransportResponse(response.status, response.reason,
+                                     _lower_headers(response.headers), data)
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            for idle in self._idle.values():
+                for connection, _ in idle:
+                    connection.close()
+                idle.clear()
+
+
+class _PooledResponseStream:
+    """Body of a streamed response. Returns the connection to the pool when closed."""
+
+    def __init__(self, transport, key, connection, response):
+        self._transport = transport
+        self._key = key
+        self._connection = connection
+        self._response = response
+
+    def read(self, size=-1):
+        try:
+            # HTTPResponse.read(-1) waits for the connection to close - None reads to the body's end
+            return self._response.read(size if size is not None and size >= 0 else None)
+        except (http.client.HTTPException, OSError) as e:
+            self.close()
+            raise URLError(e)
+
+    def close(self):
+        if self._connection is not None:
+            # Only a fully read response leaves the connection ready for reuse
+            reusable = self._response.isclosed() and not self._response.will_close
+            self._transport._release(self._key, self._connection, reusable)
+            self._connection = None
+
+
+class _StreamErrorReader:
+    """Raises the usual ConnectionError if the connection breaks while a streamed body is read."""
+
+    def __init__(self, reader, credentials):
+        self.reader = reader
+        self.credentials = credentials
+
+    def read(self, size=-1):
+        try:
+            return self.reader.read(size)
+        except URLError as e:
+            _raise_connection_error(self.credentials, e)
+        except (OSError, http.client.HTTPException) as e:
+            _raise_connection_error(self.credentials, URLError(e))
+
+
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+def default_transport():
+    """
+    Transport used by sessions that are not given one.
+
+    A PooledTransport, or a UrllibTransport if proxy environment variables
+    (e.g. HTTPS_PROXY) are set, since only urllib supports proxies.
+    """
+    if getproxies():
+        return UrllibTransport()
+    return PooledTransport()
+
+
+def _is_streamable(status):
+    """Only successful responses with a body are streamed."""
+    return 200 <= status < 300 and status != 204
+
+
+def _lower_headers(headers):
+    """Convert a headers object to a dict with lower-case header names."""
+    return {name.lower(): value for name, value in headers.items()}
+
+
+class BackgroundTokenRefresher:
+    """
+    Renews the access token of a session in a background thread.
+
+    The token is refreshed once `refresh_fraction` of its lifetime has passed,
+    so no request has to wait for the OAuth round trip. Requests keep using
+    the old (still valid) token until the new one is ready. If a background
+    refresh fails, it is retried after `retry_interval` seconds; requests still
+    refresh the token themselves if it is about to expire.
+
+    Usually started through SciNoteSession(background_refresh=True).
+    """
+
+    def __init__(self, session, refresh_fraction=0.75, retry_interval=30):
+        assert 0 < refresh_fraction < 1, "refresh_fraction must be between 0 and 1"
+        self.session = session
+        self.refresh_fraction = refresh_fraction
+        self.retry_interval = retry_interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background thread (does nothing if already running)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='scinote-token-refresher',
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _margin(self, credentials):
+        """Remaining token lifetime (seconds) at which the token is renewed."""
+        expires_in = credentials.get('access_token_expires_in', 7200)
+        return int(expires_in * (1 - self.refresh_fraction))
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                # May refresh the token itself (if it is about to expire), so it can fail too
+                credentials = self.session.get_credentials()
+                expires_at = (credentials.get('access_token_created_at', 0)
+                              + credentials.get('access_token_expires_in', 7200))
+                delay = max(0, expires_at - self._margin(credentials) - time.time())
+
+                if self._stop_event.wait(delay):
+                    break
+
+                self.session.refresh_token(margin=self._margin(credentials))
+            except Exception as e:
+                print(f"Background token refresh failed, retrying in {self.retry_interval}s: {e}")
+                self._stop_event.wait(self.retry_interval)
+
+
+# === Query Parameters ===
+
+def _encode_param(name, value):
+    """Encode one query parameter; brackets in names and values are escaped."""
+    if isinstance(value, (list, tuple, set)):
+        value = ','.join(str(item) for item in value)
+    elif isinstance(value, bool):
+        value = str(value).lower()
+    return f"{quote(str(name), safe='')}={quote(str(value), safe=',')}"
+
+
+def _add_query_param(endpoint, name, value):
+    """Append a query parameter to an endpoint path."""
+    separator = '&' if '?' in endpoint else '?'
+    return f'{endpoint}{separator}{_encode_param(name, value)}'
+
+
+def _set_query_param(endpoint, name, value):
+    """Set a query parameter of an endpoint path, replacing an existing value."""
+    path, _, query = endpoint.partition('?')
+    params = [param for param in query.split('&')
+              if param and unquote(param.partition('=')[0]) != name]
+    params.append(_encode_param(name, value))
+    return f"{path}?{'&'.join(params)}"
+
+
+def _has_query_param(endpoint, name):
+    """Check whether an endpoint path sets a query parameter (escaped or not)."""
+    query = endpoint.partition('?')[2]
+    return any(unquote(param.partition('=')[0]) == name
+               for param in query.split('&') if param)
+
+
+def build_endpoint(endpoint, fields=None, include=None, **params):
+    """
+    Add JSON:API query parameters to an endpoint path.
+
+    Parameter names like fields[tasks] or filter[name] contain brackets,
+    which are escaped here, so they don't have to be built by hand.
+
+    Args:
+        endpoint (str): API endpoint path (e.g., '/api/v1/teams/1/projects')
+        fields (dict, optional): Sparse fieldsets - resource type mapped to the
+            attributes the server should return, e.g. {'tasks': ['name', 'status_name']}.
+            Leaving out attributes you don't use makes responses smaller.
+        include (str or list, optional): Related resources to include,
+            e.g. 'protocol_steps' or ['inventory_cells']
+        **params: Other query parameters. A dict value creates bracketed
+            names: filter={'name': 'PCR'} becomes filter[name]=PCR.
+
+    Returns:
+        str: The endpoint path with the query parameters added
+
+    Example:
+        endpoint = build_endpoint(f'/api/v1/teams/{TEAM_ID}/inventories/{INVENTORY_ID}/items',
+                                  fields={'inventory_items': ['name', 'created_at']})
+    """
+    for resource_type, attributes in (fields or {}).items():
+        endpoint = _set_query_param(endpoint, f'fields[{resource_type}]', attributes)
+    if include:
+        endpoint = _set_query_param(endpoint, 'include', include)
+    for name, value in params.items():
+        if isinstance(value, dict):
+            for key, item in value.items():
+                endpoint = _set_query_param(endpoint, f'{name}[{key}]', item)
+        elif value is not None:
+            endpoint = _set_query_param(endpoint, name, value)
+    return endpoint
+
+
+# === Pagination ===
+
+
+def _page_number(link):
+    """Return the page[number] of a pagination link or endpoint, or None."""
+    if not link:
+        return None
+    number = parse_qs(urlsplit(link).query).get('page[number]')
+    return int(number[0]) if number else None
+
+
+def _endpoint_from_link(link, server_url):
+    """Turn a pagination link (e.g. links.next) into an endpoint path."""
+    if not link:
+        return None
+    if link.startswith(server_url):
+        return link[len(server_url):]
+    parts = urlsplit(link)
+    return (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+
+# === Retries ===
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is tried again and how long to wait first.
+
+    Retries happen on connection errors and on the status codes in
+    `retry_statuses` (e.g. 503 during server maintenance). Waiting times grow
+    exponentially with random jitter ("full jitter"), so many scripts don't
+    retry at the same moment. A Retry-After header from the server is honoured.
+
+    Args:
+        max_attempts (int): Total number of attempts (1 disables retries).
+        retry_statuses (tuple): HTTP status codes that are retried.
+        retry_non_idempotent (bool): Also retry POST and PATCH requests. Off by
+            default, because a retried POST could create the same item twice.
+        backoff_base (float): Maximum wait in seconds before the first retry.
+        backoff_max (float): Upper limit of the exponential wait in seconds.
+        max_retry_after (float): Upper limit for waits requested by Retry-After.
+        announce_after (float, optional): Print a message before waits of at
+            least this many seconds, so long Retry-After waits don't look
+            like a hang. None disables the messages.
+
+    Every attempt is recorded in `attempts` (most recent 1000), see summary().
+    """
+
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+    def __init__(self, max_attempts=4, retry_statuses=(429, 500, 502, 503, 504),
+                 retry_non_idempotent=False, backoff_base=0.5, backoff_max=30,
+                 max_retry_after=300, announce_after=5):
+        self.max_attempts = max_attempts
+        self.retry_statuses = retry_statuses
+        self.retry_non_idempotent = retry_non_idempotent
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self.announce_after = announce_after
+        self.attempts = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+    def retry_delay(self, method, attempt, response=None, error=None):
+        """
+        Return seconds to wait before the next attempt, or None to stop.
+
+        Args:
+            method (str): HTTP method of the request
+            attempt (int): Number of the attempt that just finished (1 = first)
+            response (TransportResponse, optional): Response of that attempt
+            error (Exception, optional): Connection error of that attempt
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if method.upper() not in self.IDEMPOTENT_METHODS and not self.retry_non_idempotent:
+            return None
+        if error is None and response.status not in self.retry_statuses:
+            return None
+
+        retry_after = _parse_retry_after(response.headers.get('retry-after')) if response else None
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def announce(self, delay, response=None, error=None):
+        """Print a message before a long wait for the next attempt."""
+        if self.announce_after is None or delay < self.announce_after:
+            return
+        if error is not None:
+            print(f"Connection failed, retrying in {delay:.0f}s...")
+        elif response.status == 429:
+            print(f"Rate limit reached (429), retrying in {delay:.0f}s...")
+        else:
+            print(f"Server busy ({response.status}), retrying in {delay:.0f}s...")
+
+    def record(self, method, endpoint, attempt, duration, response=None, error=None, delay=None):
+        """Record the timing of one attempt."""
+        with self._lock:
+            self.attempts.append({
+                'method': method.upper(),
+                'endpoint': endpoint,
+                'attempt': attempt,
+                'status': response.status if response is not None else None,
+                'error': str(error) if error is not None else None,
+                'duration': duration,
+                'retry_delay': delay,
+            })
+
+    def summary(self):
+        """
+        Summarize the recorded attempts.
+
+        Returns:
+            dict: Number of retries, seconds spent in failed attempts and
+            seconds spent waiting between attempts.
+        """
+        with self._lock:
+            retried = [a for a in self.attempts if a['retry_delay'] is not None]
+            return {
+                'attempts': len(self.attempts),
+                'retries': len(retried),
+                'failed_attempt_time': sum(a['duration'] for a in retried),
+                'retry_wait_time': sum(a['retry_delay'] for a in retried),
+            }
+
+
+def _parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+# === Rate Limiting ===
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per second on average and short
+    bursts of up to `burst` requests.
+
+    Each caller reserves the next free slot, so waiting callers are served
+    in the order they arrived - threads and asyncio tasks alike.
+    """
+
+    def __init__(self, rate, burst=1):
+        assert rate > 0, "rate must be greater than 0"
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0
+
+    def acquire(self):
+        """Wait (blocking) until a request may be sent."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait (asyncio) until a request may be sent."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """
+    Limits how fast requests are sent, to stay below the server's throttling.
+
+    Reads (GET, HEAD, OPTIONS) and writes use separate token buckets. Share one
+    RateLimiter between all sessions and clients of a process, e.g.:
+
+        get_default_session().rate_limiter = RateLimiter(read_rate=10, write_rate=2)
+
+    Args:
+        read_rate (float): Read requests per second.
+        read_burst (int): Read requests that may be sent at once after a pause.
+        write_rate (float): Write requests per second.
+        write_burst (int): Write requests that may be sent at once after a pause.
+    """
+
+    READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, read_rate=10, read_burst=20, write_rate=2, write_burst=5):
+        self.read_bucket = TokenBucket(read_rate, read_burst)
+        self.write_bucket = TokenBucket(write_rate, write_burst)
+
+    def bucket(self, method):
+        """Return the token bucket used for an HTTP method."""
+        return self.read_bucket if method.upper() in self.READ_METHODS else self.write_bucket
+
+    def acquire(self, method):
+        """Wait (blocking) until a request with this method may be sent."""
+        self.bucket(method).acquire()
+
+    async def acquire_async(self, method):
+        """Wait (asyncio) until a request with this method may be sent."""
+        await self.bucket(method).acquire_async()
+
+
+# === Compression ===
+
+class TransferStats:
+    """
+    Counts bytes on the wire versus decoded bytes, to measure compression savings.
+
+    Sent bytes are counted per attempt, received bytes per response.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            'requests': 0,
+            'bytes_sent': 0,            # Request bodies before compression
+            'bytes_sent_wire': 0,       # Request bodies as sent
+            'responses': 0,
+            'bytes_received': 0,        # Response bodies after decompression
+            'bytes_received_wire': 0,   # Response bodies as received
+        }
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                self._counters[name] += value
+
+    def snapshot(self):
+        """Return the current counters as a dict."""
+        with self._lock:
+            return dict(self._counters)
+
+
+def _decompress_body(body, encoding):
+    """Decode a gzip or deflate encoded response body."""
+    if encoding in ('gzip', 'x-gzip'):
+        return gzip.decompress(body)
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Some servers send raw deflate data without the zlib header
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+# === JSON Codecs ===
+
+class JSONCodec:
+    """Encodes and decodes JSON with Python's built-in json module."""
+
+    name = 'json'
+
+    def dumps(self, obj):
+        """Encode an object to UTF-8 JSON bytes."""
+        return json.dumps(obj).encode('utf-8')
+
+    def loads(self, data):
+        """Decode JSON bytes or str. Raises ValueError for invalid JSON."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """Encodes and decodes JSON with orjson (pip install orjson), the fastest option."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """Encodes and decodes JSON with ujson (pip install ujson)."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+
+JSON_CODECS = {'orjson': OrjsonCodec, 'ujson': UjsonCodec, 'json': JSONCodec}
+
+
+def get_codec(name=None):
+    """
+    Return a JSON codec.
+
+    Args:
+        name (str, optional): 'orjson', 'ujson' or 'json'. By default the
+            fastest installed library is used, falling back to 'json'.
+    """
+    if name is not None:
+        return JSON_CODECS[name]()
+    for codec_class in JSON_CODECS.values():
+        try:
+            return codec_class()
+        except ImportError:
+            continue
+
+
+# === Hooks ===
+
+class RequestHook:
+    """
+    Base class for objects notified about the requests of a session.
+
+    Override the methods you need and register the hook with
+    SciNoteSession(hooks=[...]) or session.add_hook(). Hooks are called in
+    the thread (or event loop) making the request, so keep them fast.
+    """
+
+    def before_request(self, method, endpoint, attempt):
+        """Called before each attempt is sent (attempt starts at 1)."""
+
+    def after_request(self, method, endpoint, attempt, duration, status,
+                      bytes_sent, bytes_received, error):
+        """
+        Called after each attempt.
+
+        Args:
+            duration (float): Seconds until the response (or error) arrived
+            status (int): HTTP status, or None if the connection failed
+            bytes_sent (int): Request body size as sent
+            bytes_received (int): Response body size as received (0 for
+                streamed responses, which are read later)
+            error (Exception): The connection error, or None
+        """
+
+    def on_retry(self, method, endpoint, attempt, delay, status, error):
+        """Called when a failed attempt will be retried after `delay` seconds."""
+
+    def on_token_refresh(self, duration):
+        """Called after the session renewed the access token."""
+
+
+# === Session ===
+
+class SciNoteSession:
+    """
+    Keeps API credentials in memory between requests.
+
+    Credentials are loaded and validated once and re-read only when the
+    credential file changes on disk (e.g. after another script refreshed
+    the token). This avoids searching for and parsing the credential file
+    before every request.
+
+    Usage:
+        session = SciNoteSession()
+        teams = session.request('GET', '/api/v1/teams')
+    """
+
+    def __init__(self, cred_file=None, transport=None, background_refresh=False,
+                 refresh_fraction=0.75, retry_policy=None, rate_limiter=None,
+                 http_cache=None, response_cache=None, compression=True,
+                 compress_requests_over=None, codec=None, hooks=None):
+        """
+        Args:
+            cred_file (str or Path, optional): Credential file to use.
+                Defaults to the most recent api_credentials_*.json file.
+            transport (optional): Object sending the HTTP requests.
+                Defaults to a PooledTransport that reuses connections
+                (UrllibTransport if a proxy is configured, see default_transport()).
+            background_refresh (bool): Renew the access token in a background
+                thread before it expires (see BackgroundTokenRefresher).
+            refresh_fraction (float): Fraction of the token lifetime after
+                which the background thread renews it.
+            retry_policy (RetryPolicy, optional): When to retry failed requests.
+                Defaults to RetryPolicy(), which retries GET, PUT and DELETE
+                requests on connection errors, 429, 500, 502, 503 and 504.
+            rate_limiter (RateLimiter, optional): Limits the request rate.
+                Pass the same RateLimiter to all sessions that should share it.
+            http_cache (scinote_cache.HTTPCache, optional): On-disk cache for
+                GET responses, revalidated with ETag/Last-Modified.
+            response_cache (scinote_cache.ResponseCache, optional): In-memory
+                cache answering repeated GET requests without contacting the
+                server. Writes through this session invalidate affected entries.
+            compression (bool): Ask the server for gzip/deflate compressed
+                responses and decompress them transparently.
+            compress_requests_over (int, optional): Gzip request bodies larger
+                than this many bytes (e.g. base64 file uploads). Off by default -
+                only enable it if your server accepts compressed request bodies.
+            codec (str or JSONCodec, optional): JSON library for request and
+                response bodies ('orjson', 'ujson' or 'json'). Defaults to the
+                fastest one installed.
+            hooks (list, optional): RequestHook objects notified about requests,
+                retries and token refreshes (e.g. scinote_metrics.MetricsCollector).
+        """
+        self.cred_file = Path(cred_file) if cred_file else _find_credential_file()
+        self.transport = transport or default_transport()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.http_cache = http_cache
+        self.response_cache = response_cache
+        self.compression = compression
+        self.compress_requests_over = compress_requests_over
+        self.transfer_stats = TransferStats()
+        self.codec = get_codec(codec) if codec is None or isinstance(codec, str) else codec
+        self.hooks = list(hooks or [])
+        self._credentials = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+        self.token_refresher = None
+        if background_refresh:
+            self.token_refresher = BackgroundTokenRefresher(self, refresh_fraction)
+            self.token_refresher.start()
+
+    def _file_mtime(self):
+        return os.stat(self.cred_file).st_mtime_ns
+
+    def add_hook(self, hook):
+        """Register a RequestHook."""
+        self.hooks.append(hook)
+
+    def _emit(self, event, *args):
+        """Call an event method on all registered hooks."""
+        for hook in self.hooks:
+            getattr(hook, event)(*args)
+
+    def _emit_attempt(self, method, endpoint, attempt, duration, data, response, error, delay):
+        """Report a finished attempt (and an upcoming retry) to the hooks."""
+        if not self.hooks:
+            return
+        status = response.status if response is not None else None
+        # Streamed responses have no body yet - their bytes are read after this call
+        received = len(response.body or b'') if response is not None else 0
+        self._emit('after_request', method, endpoint, attempt, duration, status,
+                   len(data) if data else 0, received, error)
+        if delay is not None:
+            self._emit('on_retry', method, endpoint, attempt, delay, status, error)
+
+    def _on_token_refresh(self, duration):
+        self._emit('on_token_refresh', duration)
+
+    def get_credentials(self):
+        """
+        Return valid credentials, refreshing the access token if needed.
+
+        The credential file is only re-read if its modification time changed
+        since it was last loaded.
+        """
+        with self._lock:
+            mtime = self._file_mtime()
+            if self._credentials is None or mtime != self._mtime:
+                self._credentials, _ = _load_credentials(self.cred_file)
+                self._mtime = mtime
+
+            self._credentials = _refresh_token_if_needed(self._credentials, self.cred_file,
+                                                         on_refresh=self._on_token_refresh)
+            # A refreshed token is written back to disk - remember the new
+            # modification time so the file is not read again needlessly
+            self._mtime = self._file_mtime()
+
+            return self._credentials
+
+    def refresh_token(self, margin=60):
+        """
+        Refresh the access token if it expires within `margin` seconds.
+
+        Requests made meanwhile keep using the current token; the new
+        credentials replace it once the refresh has finished.
+        """
+        credentials = dict(self.get_credentials())
+        credentials = _refresh_token_if_needed(credentials, self.cred_file, margin,
+                                               on_refresh=self._on_token_refresh)
+        with self._lock:
+            self._credentials = credentials
+            self._mtime = self._file_mtime()
+        return credentials
+
+    def request(self, method, endpoint, json_data=None, **kwargs):
+        """
+        Make an authenticated API request to SciNote.
+
+        Same arguments and return value as api_request().
+        """
+        cache = self.response_cache
+        if cache is not None and method.upper() == 'GET':
+            cached = cache.get(endpoint)
+            if cached is not None:
+                return self._decode_response(cached)
+
+        try:
+            credentials, url, response = self._send_with_retries(method, endpoint, json_data)
+        finally:
+            if cache is not None and method.upper() != 'GET':
+                # Changed data - drop cached copies of this resource and its listing
+                cache.invalidate(endpoint)
+
+        # Cache the response after HTTP cache processing (a 304 becomes the cached 200)
+        response = self._receive_response(response, url, method, credentials)
+        if response is None:
+            # The cached copy was evicted before the 304 arrived - download it again
+            credentials, url, response = self._send_with_retries(method, endpoint, json_data,
+                                                                 revalidate=False)
+            response = self._receive_final_response(response, url, method, credentials)
+        result = self._check_response(response, url, endpoint, method)
+        if cache is not None and method.upper() == 'GET':
+            cache.put(endpoint, response)
+        return result
+
+    def _send_with_retries(self, method, endpoint, json_data, stream=False, revalidate=True):
+        """Send a request, retrying per retry_policy. Returns (credentials, url, response)."""
+        attempt = 1
+        while True:
+            credentials = self.get_credentials()
+            url, data, headers = self._prepare_request(credentials, method, endpoint, json_data,
+                                                       revalidate)
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(method)
+
+            # Make request with error handling
+            self._emit('before_request', method, endpoint, attempt)
+            started = time.monotonic()
+            response = error = None
+            try:
+                # Only pass stream to transports when needed - custom ones may not support it
+                if stream:
+                    response = self.transport.send(method.upper(), url, body=data,
+                                                   headers=headers, stream=True)
+                else:
+                    response = self.transport.send(method.upper(), url, body=data,
+                                                   headers=headers)
+            except URLError as e:
+                error = e
+
+            duration = time.monotonic() - started
+            delay = self.retry_policy.retry_delay(method, attempt, response, error)
+            self.retry_policy.record(method, endpoint, attempt, duration, response, error, delay)
+            self._emit_attempt(method, endpoint, attempt, duration, data, response, error, delay)
+            if delay is None:
+                break
+            self.retry_policy.announce(delay, response, error)
+            time.sleep(delay)
+            attempt += 1
+
+        if error is not None:
+            _raise_connection_error(credentials, error)
+
+        return credentials, url, response
+
+    def _prepare_request(self, credentials, method, endpoint, json_data, revalidate=True):
+        """
+        Build the URL, body and headers of a request.
+
+        With revalidate=False, no conditional headers are added for the HTTP
+        cache, so the server sends the full response.
+        """
+        # Build full URL
+        url = credentials['server_url'] + endpoint
+
+        # Prepare request
+        headers = {
+            'Authorization': f"Bearer {credentials['access_token']}",
+            'Accept': 'application/json'
+        }
+
+        if self.compression:
+            headers['Accept-Encoding'] = 'gzip, deflate'
+
+        # Add JSON body if provided
+        data = None
+        if json_data is not None:
+            headers['Content-Type'] = 'application/vnd.api+json'
+            data = self.codec.dumps(json_data)
+            size = len(data)
+            if self.compress_requests_over is not None and size > self.compress_requests_over:
+                data = gzip.compress(data, compresslevel=6)
+                headers['Content-Encoding'] = 'gzip'
+            self.transfer_stats.add(bytes_sent=size, bytes_sent_wire=len(data))
+        self.transfer_stats.add(requests=1)
+
+        # Ask the server to send data only if it changed since it was cached
+        if self.http_cache is not None and method.upper() == 'GET' and revalidate:
+            headers.update(self.http_cache.conditional_headers(
+                self.http_cache.key(url, credentials)))
+
+        return url, data, headers
+
+    def _parse_response(self, response, url, endpoint, method, credentials):
+        """Raise helpful errors for failed requests, otherwise decode the JSON body."""
+        response = self._receive_final_response(response, url, method, credentials)
+        return self._check_response(response, url, endpoint, method)
+
+    def _receive_final_response(self, response, url, method, credentials):
+        """_receive_response() for a response that can't be sent again: keeps a 304."""
+        return self._receive_response(response, url, method, credentials) or response
+
+    def _receive_response(self, response, url, method, credentials):
+        """
+        Decompress a response and pass it through the HTTP cache.
+
+        Returns:
+            TransportResponse: The response to use - for a 304 answered from
+            the HTTP cache, the cached 200 response. None for a 304 whose
+            cached copy was evicted in the meantime: send the request again
+            with revalidate=False.
+        """
+        wire_size = len(response.body)
+        encoding = response.headers.pop('content-encoding', 'identity').lower()
+        response.body = _decompress_body(response.body, encoding)
+        self.transfer_stats.add(responses=1, bytes_received=len(response.body),
+                                bytes_received_wire=wire_size)
+
+        if self.http_cache is not None and method.upper() == 'GET':
+            response = self.http_cache.process(self.http_cache.key(url, credentials), response)
+        return response
+
+    def _check_response(self, response, url, endpoint, method):
+        """Raise helpful errors for a received response, otherwise decode its body."""
+        # Anything but 2xx is an error here: redirects were already followed
+        # and 304 responses answered from the HTTP cache
+        if not 200 <= response.status < 300:
+            _handle_api_error(response.to_http_error(url), endpoint, method)
+
+        return self._decode_response(response)
+
+    def _decode_response(self, response):
+        """Decode the JSON body of a successful response."""
+        # Parse JSON response (if any)
+        if not response.body:
+            return {'success': True}  # For DELETE requests with no body
+
+        try:
+            return self.codec.loads(response.body)
+        except ValueError as e:
+            raise ValueError(
+                f"Server returned invalid JSON response.\n"
+                f"Error: {e}\n"
+                f"→ This might indicate a server error. Contact SciNote support."
+            )
+
+    def stream(self, endpoint, chunk_size=64 * 1024):
+        """
+        GET an endpoint and parse the response while it is being downloaded.
+
+        Instead of reading the whole body into one big dict, the resources
+        of `data` and `included` are decoded one at a time, so memory use
+        stays small even for very large responses. Streamed responses are
+        not stored in the session's caches.
+
+        Args:
+            endpoint (str): API endpoint path
+            chunk_size (int): Number of bytes read from the connection at a time
+
+        Returns:
+            scinote_stream.JSONAPIStream: Iterate over it for (member, resource)
+            tuples, where member is 'data' or 'included'. Afterwards its
+            `members` dict holds the other top-level members (links, meta).
+
+        Raises:
+            ConnectionError: Also while iterating, if the connection breaks
+                before the whole response was received
+        """
+        from scinote_stream import JSONAPIStream, DecompressingReader
+
+        credentials, url, response = self._send_with_retries('GET', endpoint, None, stream=True)
+        if self.http_cache is not None and response.status == 304:
+            cached = self.http_cache.process(self.http_cache.key(url, credentials), response)
+            if cached is None:
+                # The cached copy was evicted before the 304 arrived - download it again
+                credentials, url, response = self._send_with_retries(
+                    'GET', endpoint, None, stream=True, revalidate=False)
+            else:
+                response = cached
+
+        if response.stream is None:
+            # Errors, cached (304) responses and transports without streaming support
+            if not 200 <= response.status < 300:
+                self._parse_response(response, url, endpoint, 'GET', credentials)
+            reader, on_close = io.BytesIO(response.body), None
+        else:
+            reader, on_close = _StreamErrorReader(response.stream, credentials), response.stream.close
+
+        encoding = response.headers.get('content-encoding', 'identity').lower()
+        if encoding != 'identity':
+            reader = DecompressingReader(reader, encoding)
+        return JSONAPIStream(reader, chunk_size, on_close)
+
+    def iter_pages(self, endpoint, page_size=100, prefetch=0):
+        """
+        Yield each page of a list endpoint, following the links.next URLs.
+
+        Only one page is kept in memory at a time, unless pages are prefetched.
+
+        Args:
+            endpoint (str): API endpoint path of a list (e.g., '/api/v1/teams/1/projects')
+            page_size (int, optional): Number of items per page (max 100).
+                Not added if the endpoint already sets page[size].
+            prefetch (int): Number of pages to fetch in parallel. With 0, pages
+                are fetched one after another. Pages are always yielded in order.
+
+        Yields:
+            dict: Parsed JSON response of each page
+        """
+        if page_size and not _has_query_param(endpoint, 'page[size]'):
+            endpoint = _add_query_param(endpoint, 'page[size]', page_size)
+
+        if prefetch:
+            yield from self._iter_pages_prefetched(endpoint, prefetch)
+            return
+
+        while endpoint:
+            page = self.request('GET', endpoint)
+            next_link = (page.get('links') or {}).get('next')
+            yield page
+
+            next_endpoint = _endpoint_from_link(next_link, self.get_credentials()['server_url'])
+            endpoint = next_endpoint if next_endpoint != endpoint else None
+
+    def _iter_pages_prefetched(self, endpoint, workers):
+        """
+        Yield pages in order while the following pages are fetched in parallel.
+
+        The number of pages is read from links.last of the first page. At most
+        `workers` pages are fetched ahead, and fetching stops as soon as the
+        caller stops iterating.
+        """
+        first_page = self.request('GET', endpoint)
+        yield first_page
+
+        last_page = _page_number((first_page.get('links') or {}).get('last'))
+        if last_page is None:
+            # Page count unknown - continue by following links.next
+            next_endpoint = _endpoint_from_link((first_page.get('links') or {}).get('next'),
+                                                self.get_credentials()['server_url'])
+            if next_endpoint and next_endpoint != endpoint:
+                yield from self.iter_pages(next_endpoint, page_size=None)
+            return
+
+        page_numbers = iter(range((_page_number(endpoint) or 1) + 1, last_page + 1))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scinote-prefetch')
+        pending = deque()
+
+        def fetch_next():
+            number = next(page_numbers, None)
+            if number is not None:
+                page_endpoint = _set_query_param(endpoint, 'page[number]', number)
+                # Run in a copy of the caller's context (e.g. its tracing span)
+                pending.append(executor.submit(contextvars.copy_context().run,
+                                               self.request, 'GET', page_endpoint))
+
+        try:
+            for _ in range(workers):
+                fetch_next()
+            while pending:
+                page = pending.popleft().result()
+                fetch_next()
+                yield page
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_resources(self, endpoint, page_size=100, prefetch=0, stream=False):
+        """
+        Yield the resources of a list endpoint one at a time, across all pages.
+
+        Same arguments as iter_pages(). With stream=True, each page is parsed
+        while it is downloaded (see stream()), so not even a whole page is
+        held in memory. Streaming can't be combined with prefetch.
+        """
+        if not stream:
+            for page in self.iter_pages(endpoint, page_size, prefetch):
+                yield from page.get('data', [])
+            return
+
+        assert not prefetch, "stream=True can't be combined with prefetch"
+        if page_size and not _has_query_param(endpoint, 'page[size]'):
+            endpoint = _add_query_param(endpoint, 'page[size]', page_size)
+
+        while endpoint:
+            page = self.stream(endpoint)
+            for member, resource in page:
+                if member == 'data':
+                    yield resource
+
+            next_link = (page.members.get('links') or {}).get('next')
+            next_endpoint = _endpoint_from_link(next_link, self.get_credentials()['server_url'])
+            endpoint = next_endpoint if next_endpoint != endpoint else None
+
+    def close(self):
+        """Stop the background token refresher and close open connections."""
+        if self.token_refresher is not None:
+            self.token_refresher.stop()
+        self.transport.close()
+
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+def get_default_session():
+    """
+    Return the session used by api_request(), creating it on first use.
+
+    Environment variables change how the session sends requests:
+    - SCINOTE_FAULTS: inject faults (JSON options of scinote_faults.FaultInjectingTransport)
+    - SCINOTE_RECORD: record requests and responses to this cassette file
+    - SCINOTE_REPLAY: answer requests from this cassette file, without a server
+      (SCINOTE_REPLAY_TIMING=fast skips the recorded response times)
+    """
+    global _default_session
+    if _default_session is None:
+        with _default_session_lock:
+            if _default_session is None:
+                _default_session = _session_from_environment()
+    return _default_session
+
+
+def _session_from_environment():
+    """Create the default session, applying the SCINOTE_* environment variables."""
+    if os.environ.get('SCINOTE_REPLAY'):
+        from scinote_cassette import replay_session
+        return replay_session(os.environ['SCINOTE_REPLAY'],
+                              timing=os.environ.get('SCINOTE_REPLAY_TIMING', 'original'))
+
+    transport = None
+    if os.environ.get('SCINOTE_FAULTS'):
+        from scinote_faults import FaultInjectingTransport
+        transport = FaultInjectingTransport.from_spec(os.environ['SCINOTE_FAULTS'])
+    if os.environ.get('SCINOTE_RECORD'):
+        from scinote_cassette import RecordingTransport
+        transport = RecordingTransport(os.environ['SCINOTE_RECORD'], transport)
+    return SciNoteSession(transport=transport)
+
+
+def set_default_session(session):
+    """
+    Replace the session used by api_request().
+
+    Useful to pick a specific credential file or to enable optional
+    session features for all templates. Pass None to reset.
+    """
+    global _default_session
+    with _default_session_lock:
+        _default_session = session
+
+
 def api_request(method, endpoint, json_data=None, **kwargs):
     """
     Make an authenticated API request to SciNote.
 
     Automatically handles:
-    - Finding and loading credentials
+    - Finding and loading credentials (once per process)
     - Token refresh if expired
     - Authentication headers
     - Error handling with clear messages
@@ -300,51 +1678,31 @@ def api_request(method, endpoint, json_data=None, **kwargs):
                              json_data={'data': {'type': 'projects',
                                                 'attributes': {'name': 'Updated Name'}}})
     """
-    # Load and refresh credentials
-    credentials, cred_file = _load_credentials()
-    credentials = _refresh_token_if_needed(credentials, cred_file)
+    return get_default_session().request(method, endpoint, json_data, **kwargs)
 
-    # Build full URL
-    url = credentials['server_url'] + endpoint
 
-    # Prepare request
-    headers = {
-        'Authorization': f"Bearer {credentials['access_token']}",
-        'Accept': 'application/json'
-    }
+def iter_pages(endpoint, page_size=100, prefetch=0):
+    """
+    Yield each page of a list endpoint, following the links.next URLs.
 
-    # Add JSON body if provided
-    data = None
-    if json_data is not None:
-        headers['Content-Type'] = 'application/vnd.api+json'
-        data = json.dumps(json_data).encode('utf-8')
+    Set prefetch to fetch that many pages in parallel (see SciNoteSession.iter_pages).
 
-    # Create request
-    request = Request(url, data=data, headers=headers, method=method.upper())
+    Example:
+        for page in iter_pages(f'/api/v1/teams/1/inventories/3/items', prefetch=4):
+            print(len(page['data']), 'items on this page')
+    """
+    return get_default_session().iter_pages(endpoint, page_size, prefetch)
 
-    # Make request with error handling
-    try:
-        response = urlopen(request)
-        response_body = response.read().decode()
 
-        # Parse JSON response (if any)
-        if response_body:
-            return json.loads(response_body)
-        else:
-            return {'success': True}  # For DELETE requests with no body
+def iter_resources(endpoint, page_size=100, prefetch=0, stream=False):
+    """
+    Yield all resources of a list endpoint one at a time, across all pages.
 
-    except HTTPError as e:
-        _handle_api_error(e, endpoint, method)
-    except URLError as e:
-        raise ConnectionError(
-            f"Cannot connect to SciNote server: {credentials['server_url']}\n"
-            f"Error: {e.reason}\n\n"
-            "→ Check your internet connection\n"
-            "→ Verify the server URL is correct"
-        )
-    except json.JSONDecodeError as e:
-        raise ValueError(
-            f"Server returned invalid JSON response.\n"
-            f"Error: {e}\n"
-            f"→ This might indicate a server error. Contact SciNote support."
-        )
+    Set stream=True to parse each page while it is downloaded, which keeps
+    memory use low for pages with many large items.
+
+    Example:
+        for project in iter_resources('/api/v1/teams/1/projects'):
+            print(project['attributes']['name'])
+    """
+    return get_default_session().iter_resources(endpoint, page_size, prefetch, stream)
@@ -0,0 +1,325 @@
+"""
+SciNote API Client - asyncio version
+
+Provides the same request handling as scinote_api.api_request() for programs
+that run on asyncio: credential files, token refresh, JSON:API bodies and the
+same helpful error messages. Requests are sent over a pool of keep-alive
+connections, and the number of requests running at the same time is limited.
+
+Usage:
+    import asyncio
+    from scinote_async import AsyncSciNoteClient
+
+    async def main():
+        async with AsyncSciNoteClient() as client:
+            teams = await client.request('GET', '/api/v1/teams')
+
+            # Many requests at once
+            projects = await asyncio.gather(*[
+                client.request('GET', f'/api/v1/teams/{team["id"]}/projects')
+                for team in teams['data']
+            ])
+
+    asyncio.run(main())
+
+Cancelling a task that waits for a request (e.g. with asyncio.wait_for())
+closes the connection it was using, so no half-read response is reused.
+"""
+
+import asyncio
+import ssl
+import time
+import weakref
+from urllib.parse import urlsplit
+from urllib.error import URLError
+
+from scinote_api import (SciNoteSession, TransportResponse, get_default_session,
+                         _token_is_valid, _raise_connection_error)
+
+
+class AsyncConnectionPool:
+    """
+    Sends HTTP/1.1 requests over reusable asyncio connections.
+
+    Args:
+        max_connections_per_host (int): Maximum number of open connections
+            per host. Further requests wait until a connection is free.
+        idle_timeout (float): Seconds after which an unused connection is closed.
+        timeout (float, optional): Timeout in seconds for a whole request.
+    """
+
+    def __init__(self, max_connections_per_host=20, idle_timeout=30, timeout=None):
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = {}        # (scheme, host, port) -> [(reader, writer, last_used), ...]
+        self._slots = {}       # (scheme, host, port) -> semaphore limiting open connections
+        self._ssl_context = ssl.create_default_context()
+
+    async def _acquire(self, key):
+        """Return (reader, writer, reused) for a host. Call while holding a slot."""
+        now = time.monotonic()
+        idle = self._idle.setdefault(key, [])
+        # Close connections that have been unused for too long
+        while idle and now - idle[0][2] > self.idle_timeout:
+            idle.pop(0)[1].close()
+        while idle:
+            reader, writer, _ = idle.pop()
+            if not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+
+        scheme, host, port = key
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self._ssl_context if scheme == 'https' else None)
+        return reader, writer, False
+
+    async def send(self, method, url, body=None, headers=None):
+        """Send a request and return a TransportResponse."""
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'https'
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == 'https' else 80))
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+        request_headers = {'Host': parts.netloc, 'Connection': 'keep-alive'}
+        request_headers.update(headers or {})
+        request_headers['Content-Length'] = str(len(body or b''))
+        head = f'{method} {path} HTTP/1.1\r\n' + ''.join(
+            f'{name}: {value}\r\n' for name, value in request_headers.items()) + '\r\n'
+        payload = head.encode('latin-1') + (body or b'')
+
+        slots = self._slots.setdefault(
+            key, asyncio.Semaphore(self.max_connections_per_host))
+        async with slots:
+            while True:
+                try:
+                    reader, writer, reused = await self._acquire(key)
+                except OSError as e:
+                    raise URLError(e)
+
+                try:
+                    writer.write(payload)
+                    await writer.drain()
+                    exchange = _read_response(reader, method)
+                    if self.timeout is not None:
+                        exchange = asyncio.wait_for(exchange, self.timeout)
+                    response, keep_alive = await exchange
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    writer.close()
+                    if reused:
+                        # The server closed an idle keep-alive connection - retry on a new one
+                        continue
+                    raise URLError(e)
+                except (OSError, ValueError, asyncio.TimeoutError) as e:
+                    writer.close()
+                    raise URLError(e)
+                except BaseException:
+                    # Cancelled mid-request - the connection is in an unknown state
+                    writer.close()
+                    raise
+
+                if keep_alive:
+                    self._idle[key].append((reader, writer, time.monotonic()))
+                else:
+                    writer.close()
+                return response
+
+    async def close(self):
+        """Close all idle connections."""
+        for idle in self._idle.values():
+            for _, writer, _ in idle:
+                writer.close()
+            idle.clear()
+
+
+async def _read_response(reader, method):
+    """Read one HTTP/1.1 response. Returns (TransportResponse, keep_alive)."""
+    status_line = (await reader.readuntil(b'\r\n')).decode('latin-1').rstrip('\r\n')
+    version, status, *reason = status_line.split(' ', 2)
+    status = int(status)
+
+    headers = {}
+    while True:
+        line = (await reader.readuntil(b'\r\n')).decode('latin-1').rstrip('\r\n')
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        name = name.strip().lower()
+        value = value.strip()
+        headers[name] = f'{headers[name]}, {value}' if name in headers else value
+
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        body = b''
+    elif headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size_line = await reader.readuntil(b'\r\n')
+            size = int(size_line.split(b';')[0], 16)
+            if size == 0:
+                # Skip optional trailer headers
+                while await reader.readuntil(b'\r\n') != b'\r\n':
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b''.join(chunks)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        body = await reader.read()
+        keep_alive = False
+
+    return TransportResponse(status, reason[0] if reason else '', headers, body), keep_alive
+
+
+class AsyncSciNoteClient:
+    """
+    asyncio client for the SciNote API.
+
+    Args:
+        cred_file (str or Path, optional): Credential file to use.
+            Defaults to the most recent api_credentials_*.json file.
+        session (SciNoteSession, optional): Session providing credentials.
+            Created from cred_file if not given.
+        max_concurrency (int): Maximum number of requests running at once.
+        max_connections_per_host (int): Maximum number of open connections.
+        timeout (float, optional): Timeout in seconds for a single request.
+
+    Requests go through the client's own connection pool, except when the
+    session's transport sets route_async_requests (the record and replay
+    transports of scinote_cassette): then they are sent through that
+    transport in worker threads, so they are recorded or replayed, too.
+    """
+
+    def __init__(self, cred_file=None, session=None, max_concurrency=100,
+                 max_connections_per_host=20, timeout=None):
+        self.session = session or SciNoteSession(cred_file)
+        self.pool = AsyncConnectionPool(max_connections_per_host, timeout=timeout)
+        self._session_transport = (self.session.transport if getattr(
+            self.session.transport, 'route_async_requests', False) else None)
+        self._concurrency = asyncio.Semaphore(max_concurrency)
+        self._credentials = None
+        self._credentials_lock = asyncio.Lock()
+
+    async def get_credentials(self):
+        """Return valid credentials, refreshing the token in a worker thread if needed."""
+        credentials = self._credentials
+        if credentials is not None and _token_is_valid(credentials):
+            return credentials
+
+        async with self._credentials_lock:
+            if self._credentials is None or not _token_is_valid(self._credentials):
+                # Reading the file and refreshing the token are blocking calls
+                self._credentials = dict(await asyncio.to_thread(self.session.get_credentials))
+            return self._credentials
+
+    async def request(self, method, endpoint, json_data=None):
+        """
+        Make an authenticated API request to SciNote.
+
+        Same arguments, return value and errors as scinote_api.api_request().
+        Failed requests are retried according to the session's retry_policy,
+        and the session's rate_limiter (if any) is respected. The session's
+        hooks are notified about each attempt.
+        """
+        cache = self.session.response_cache
+        if cache is not None and method.upper() == 'GET':
+            cached = cache.get(endpoint)
+            if cached is not None:
+                return self.session._decode_response(cached)
+
+        try:
+            credentials, url, response = await self._send_with_retries(
+                method, endpoint, json_data)
+        finally:
+            if cache is not None and method.upper() != 'GET':
+                # Changed data - drop cached copies of this resource and its listing
+                cache.invalidate(endpoint)
+
+        # Cache the response after HTTP cache processing (a 304 becomes the cached 200)
+        response = self.session._receive_response(response, url, method, credentials)
+        if response is None:
+            # The cached copy was evicted before the 304 arrived - download it again
+            credentials, url, response = await self._send_with_retries(
+                method, endpoint, json_data, revalidate=False)
+            response = self.session._receive_final_response(response, url, method, credentials)
+        result = self.session._check_response(response, url, endpoint, method)
+        if cache is not None and method.upper() == 'GET':
+            cache.put(endpoint, response)
+        return result
+
+    async def _send_with_retries(self, method, endpoint, json_data, revalidate=True):
+        """Send a request, retrying per the session's retry_policy."""
+        retry_policy = self.session.retry_policy
+        attempt = 1
+        while True:
+            if self.session.rate_limiter is not None:
+                await self.session.rate_limiter.acquire_async(method)
+
+            async with self._concurrency:
+                credentials = await self.get_credentials()
+                url, data, headers = self.session._prepare_request(
+                    credentials, method, endpoint, json_data, revalidate)
+
+                self.session._emit('before_request', method, endpoint, attempt)
+                started = time.monotonic()
+                response = error = None
+                try:
+                    if self._session_transport is not None:
+                        response = await asyncio.to_thread(
+                            self._session_transport.send, method.upper(), url, body=data,
+                            headers=headers)
+                    else:
+                        response = await self.pool.send(method.upper(), url, body=data,
+                                                        headers=headers)
+                except URLError as e:
+                    error = e
+
+            duration = time.monotonic() - started
+            delay = retry_policy.retry_delay(method, attempt, response, error)
+            retry_policy.record(method, endpoint, attempt, duration, response, error, delay)
+            self.session._emit_attempt(method, endpoint, attempt, duration, data, response,
+                                       error, delay)
+            if delay is None:
+                break
+            retry_policy.announce(delay, response, error)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if error is not None:
+            _raise_connection_error(credentials, error)
+
+        return credentials, url, response
+
+    async def close(self):
+        """Close open connections."""
+        await self.pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+_default_clients = weakref.WeakKeyDictionary()
+
+
+async def async_api_request(method, endpoint, json_data=None):
+    """
+    asyncio version of scinote_api.api_request().
+
+    Uses one shared AsyncSciNoteClient per event loop, with credentials from
+    the default session of scinote_api.
+
+    Example:
+        teams = await async_api_request('GET', '/api/v1/teams')
+    """
+    loop = asyncio.get_running_loop()
+    client = _default_clients.get(loop)
+    if client is None:
+        client = _default_clients[loop] = AsyncSciNoteClient(session=get_default_session())
+    return await client.request(method, endpoint, json_data)
@@ -0,0 +1,264 @@
+"""
+SciNote API Client - Response Caching
+
+Two optional caches can be attached to a SciNoteSession:
+
+ResponseCache keeps recent GET responses in memory for a few seconds, so
+notebooks and dashboards that ask for the same team or project over and over
+don't contact the server each time. Writes (POST/PATCH/DELETE) made through
+the session remove the affected entries.
+
+HTTPCache keeps GET responses on disk together with their ETag and
+Last-Modified validators. When the same URL is requested again, the server
+is asked whether the data has changed (If-None-Match / If-Modified-Since);
+if it answers "304 Not Modified", the stored response is used and the
+payload is not downloaded again.
+
+Usage:
+    from scinote_api import SciNoteSession, set_default_session
+    from scinote_cache import HTTPCache, ResponseCache
+
+    set_default_session(SciNoteSession(
+        http_cache=HTTPCache('.scinote_cache'),
+        response_cache=ResponseCache(default_ttl=30),
+    ))
+
+    # ... run api_request() calls as usual ...
+
+    print(get_default_session().http_cache.stats())
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from scinote_api import TransportResponse
+
+
+class HTTPCache:
+    """
+    Persistent cache of GET responses, revalidated with ETag/Last-Modified.
+
+    Entries are stored in an SQLite database inside `directory`. When the
+    cache grows beyond `max_size` bytes, the least recently used entries
+    are removed. Entries are keyed by URL and credential identity (server
+    and API user), so different users never share cached data.
+
+    Args:
+        directory (str or Path): Directory for the cache database.
+        max_size (int): Maximum total size of cached bodies in bytes.
+    """
+
+    def __init__(self, directory='.scinote_cache', max_size=100 * 1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_size = max_size
+        self._db = sqlite3.connect(os.path.join(directory, 'http_cache.sqlite3'),
+                                   timeout=30, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, headers TEXT,'
+            ' body BLOB, size INTEGER, last_access REAL)'
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,          # GET requests seen by the cache
+            'misses': 0,            # No cached copy - full download
+            'revalidations': 0,     # Conditional requests sent
+            'hits': 0,              # Server answered 304 - served from disk
+            'updated': 0,           # Cached copy was outdated - replaced
+            'bytes_from_cache': 0,  # Payload bytes not downloaded thanks to 304s
+        }
+
+    @staticmethod
+    def key(url, credentials):
+        """Cache key for a GET request made with the given credentials."""
+        identity = f"{credentials['server_url']}|{credentials['api_uid']}|GET|{url}"
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def conditional_headers(self, key):
+        """Return If-None-Match / If-Modified-Since headers for a cached entry."""
+        with self._lock:
+            self._stats['requests'] += 1
+            row = self._db.execute('SELECT etag, last_modified FROM entries WHERE key = ?',
+                                   (key,)).fetchone()
+            if row is None:
+                self._stats['misses'] += 1
+                return {}
+            self._stats['revalidations'] += 1
+
+        etag, last_modified = row
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def process(self, key, response):
+        """
+        Return the response to use for a GET request.
+
+        A 304 response is replaced by the cached copy. If that copy was
+        evicted after conditional_headers(), None is returned instead - send
+        the request again without conditional headers. Successful responses
+        with an ETag or Last-Modified header are stored.
+        """
+        if response.status == 304:
+            with self._lock:
+                row = self._db.execute('SELECT headers, body FROM entries WHERE key = ?',
+                                       (key,)).fetchone()
+                if row is None:
+                    return None
+                self._db.execute('UPDATE entries SET last_access = ? WHERE key = ?',
+                                 (time.time(), key))
+                self._db.commit()
+                self._stats['hits'] += 1
+                self._stats['bytes_from_cache'] += len(row[1])
+            return TransportResponse(200, 'OK', json.loads(row[0]), row[1])
+
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        if response.status == 200 and (etag or last_modified):
+            self._store(key, etag, last_modified, response)
+        return response
+
+    def _store(self, key, etag, last_modified, response):
+        with self._lock:
+            replaced = self._db.execute('DELETE FROM entries WHERE key = ?', (key,)).rowcount
+            self._db.execute(
+                'INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, etag, last_modified, json.dumps(response.headers), response.body,
+                 len(response.body), time.time())
+            )
+            if replaced:
+                self._stats['updated'] += 1
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits into max_size."""
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_size:
+            return
+        for key, size in self._db.execute(
+                'SELECT key, size FROM entries ORDER BY last_access').fetchall():
+            self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_size:
+                break
+
+    def stats(self):
+        """Return hit/miss/revalidation counters and the current cache size."""
+        with self._lock:
+            count, size = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+            return dict(self._stats, entries=count, size=size)
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._db.execute('DELETE FROM entries')
+            self._db.commit()
+
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            self._db.close()
+
+
+class ResponseCache:
+    """
+    In-memory cache of GET responses with time-to-live per endpoint pattern.
+
+    A write request through the session (POST/PATCH/PUT/DELETE) removes the
+    cached copies of the changed resource, everything below it, and the
+    listing it belongs to. For example, a PATCH on
+    /api/v1/teams/1/projects/5 removes /api/v1/teams/1/projects/5 (and its
+    experiments etc.) as well as /api/v1/teams/1/projects.
+
+    Changes made by other programs or in the web interface are only seen
+    once an entry expires, so keep the TTLs short.
+
+    Args:
+        default_ttl (float): Seconds a response stays cached if no pattern matches.
+        ttls (dict, optional): Endpoint patterns (shell-style wildcards, matched
+            against the path without query string) mapped to TTLs in seconds.
+            The first matching pattern wins; a TTL of 0 disables caching.
+            Example: {'/api/v1/teams/*/inventories/*/items': 5, '/api/v1/teams*': 300}
+        max_entries (int): Maximum number of cached responses (least recently
+            used ones are dropped first).
+    """
+
+    def __init__(self, default_ttl=30, ttls=None, max_entries=1000):
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # endpoint -> (expires_at, response)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def ttl_for(self, endpoint):
+        """Return the TTL in seconds for an endpoint."""
+        path = _path(endpoint)
+        for pattern, ttl in self.ttls.items():
+            if fnmatch.fnmatchcase(path, pattern):
+                return ttl
+        return self.default_ttl
+
+    def get(self, endpoint):
+        """Return the cached response for an endpoint, or None."""
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[endpoint]
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(endpoint)
+            self._stats['hits'] += 1
+            return entry[1]
+
+    def put(self, endpoint, response):
+        """Cache a successful response."""
+        ttl = self.ttl_for(endpoint)
+        if response.status != 200 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[endpoint] = (time.monotonic() + ttl, response)
+            self._entries.move_to_end(endpoint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint):
+        """Remove cached entries affected by a write to an endpoint."""
+        path = _path(endpoint).rstrip('/')
+        listing = path.rsplit('/', 1)[0]
+        with self._lock:
+            for cached in list(self._entries):
+                cached_path = _path(cached).rstrip('/')
+                if (cached_path == path or cached_path.startswith(path + '/')
+                        or cached_path == listing):
+                    del self._entries[cached]
+                    self._stats['invalidations'] += 1
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss/invalidation counters and the number of entries."""
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+
+def _path(endpoint):
+    """Endpoint path without query string."""
+    return endpoint.split('?', 1)[0]
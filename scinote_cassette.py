@@ -0,0 +1,253 @@
+"""
+SciNote API Client - Record and Replay
+
+Records the requests and responses of a script in a "cassette" file, so the
+same traffic can be replayed later without network access or credentials -
+for example to benchmark a change to the client with the exact requests of
+a real export.
+
+Cassettes are SQLite files. Response bodies are stored compressed, and an
+index on (method, URL, request body) makes lookups fast. Access tokens are
+never written: request headers are not stored, and token values in response
+bodies are replaced by '[scrubbed]'. URLs are stored without the server
+address, and bodies are stored decompressed (replayed responses are not
+gzip-encoded).
+
+Usage:
+    # Record a run of a template
+    SCINOTE_RECORD=export.cassette python3 templates/08_advanced/export_project_data.py
+
+    # Replay it offline, with the recorded response times or as fast as possible
+    SCINOTE_REPLAY=export.cassette python3 templates/08_advanced/export_project_data.py
+    SCINOTE_REPLAY=export.cassette SCINOTE_REPLAY_TIMING=fast python3 ...
+
+    # Or in Python
+    from scinote_cassette import RecordingTransport, replay_session
+    session = SciNoteSession(transport=RecordingTransport('export.cassette'))
+    session = replay_session('export.cassette', timing='fast')
+
+AsyncSciNoteClient (and async_api_request()) send their requests through
+these transports, in worker threads, when the session uses one.
+"""
+
+import hashlib
+import io
+import json
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import weakref
+import zlib
+from collections import deque
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from scinote_api import SciNoteSession, TransportResponse, _decompress_body, default_transport
+
+_SECRET_VALUES = re.compile(
+    rb'("(?:access_token|refresh_token|api_secret|client_secret)"\s*:\s*)"[^"]*"')
+
+# Response headers worth keeping for replay
+_KEPT_HEADERS = ('content-type', 'etag', 'last-modified', 'retry-after')
+
+
+def _scrub(body):
+    """Replace token values in a JSON body."""
+    return _SECRET_VALUES.sub(rb'\1"[scrubbed]"', body) if body else body
+
+
+def _request_key(method, url, body, headers=None):
+    """Method, URL path with query, and a hash of the (uncompressed) request body."""
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    # Compressed bodies differ between runs (gzip stores a timestamp), their content doesn't
+    encoding = {name.lower(): value for name, value in (headers or {}).items()}.get(
+        'content-encoding', 'identity')
+    if body and encoding.lower() != 'identity':
+        body = _decompress_body(body, encoding.lower())
+    return method.upper(), path, hashlib.sha256(body or b'').hexdigest()
+
+
+def _connect(path):
+    db = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+    db.execute(
+        'CREATE TABLE IF NOT EXISTS interactions ('
+        ' seq INTEGER PRIMARY KEY, method TEXT, path TEXT, body_hash TEXT,'
+        ' status INTEGER, reason TEXT, headers TEXT, body BLOB, started REAL, duration REAL)'
+    )
+    db.execute('CREATE INDEX IF NOT EXISTS interactions_key'
+               ' ON interactions (method, path, body_hash, seq)')
+    db.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+    return db
+
+
+class RecordingTransport:
+    """
+    Wraps a transport and records every request and response to a cassette.
+
+    Recording appends to an existing cassette. Streamed responses are read
+    completely so they can be stored, then handed on from memory.
+
+    Args:
+        path (str or Path): Cassette file
+        transport (optional): The wrapped transport. Defaults to default_transport().
+    """
+
+    route_async_requests = True   # Record AsyncSciNoteClient requests, too
+
+    def __init__(self, path, transport=None):
+        self.path = Path(path)
+        self.transport = transport or default_transport()
+        self._db = _connect(self.path)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.recorded = 0
+
+    def send(self, method, url, body=None, headers=None, stream=False):
+        started = time.monotonic()
+        # Only pass stream to the wrapped transport when needed
+        if stream:
+            response = self.transport.send(method, url, body=body, headers=headers, stream=True)
+        else:
+            response = self.transport.send(method, url, body=body, headers=headers)
+
+        content = response.body
+        if response.stream is not None:
+            try:
+                content = response.stream.read()
+            finally:
+                response.stream.close()
+            response.stream = io.BytesIO(content)
+        duration = time.monotonic() - started
+
+        self._record(url, _request_key(method, url, body, headers), response, content,
+                     started - self._started, duration)
+        return response
+
+    def _record(self, url, key, response, content, started, duration):
+        parts = urlsplit(url)
+        kept = {name: value for name, value in response.headers.items()
+                if name in _KEPT_HEADERS}
+        # Stored decompressed, so tokens can be scrubbed (the cassette itself is compressed)
+        encoding = response.headers.get('content-encoding', 'identity').lower()
+        content = _scrub(_decompress_body(content or b'', encoding))
+        with self._lock:
+            self._db.execute(
+                'INSERT OR IGNORE INTO meta VALUES (?, ?)',
+                ('server_url', f'{parts.scheme}://{parts.netloc}'))
+            self._db.execute(
+                'INSERT INTO interactions (method, path, body_hash, status, reason, headers,'
+                ' body, started, duration) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (*key, response.status, response.reason, json.dumps(kept),
+                 zlib.compress(content or b''), started, duration))
+            self._db.commit()
+            self.recorded += 1
+
+    def close(self):
+        self.transport.close()
+        with self._lock:
+            self._db.close()
+
+
+class ReplayTransport:
+    """
+    Answers requests from a cassette instead of a server.
+
+    Requests are matched by method, URL (without the server address) and
+    request body. If the same request was recorded several times, the
+    responses are returned in the recorded order; after the last one, it is
+    repeated.
+
+    Args:
+        path (str or Path): Cassette file
+        timing (str): 'original' waits as long as the recorded response took
+            ('speed' times faster), 'fast' answers immediately.
+        speed (float): Replay speed factor for timing='original'.
+
+    Raises:
+        LookupError: When a request is not in the cassette
+    """
+
+    route_async_requests = True   # Answer AsyncSciNoteClient requests, too
+
+    def __init__(self, path, timing='original', speed=1.0):
+        if timing not in ('original', 'fast'):
+            raise ValueError(f"Unknown replay timing '{timing}'.\n"
+                             f"→ Use 'original' or 'fast'")
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Cassette not found: {path}\n"
+                                    f"→ Record one first with SCINOTE_RECORD={path}")
+        self.path = Path(path)
+        self.timing = timing
+        self.speed = speed
+        self._db = _connect(self.path)
+        self._lock = threading.Lock()
+        self._index = {}   # request key -> deque of (seq, duration)
+        for seq, method, path_, body_hash, duration in self._db.execute(
+                'SELECT seq, method, path, body_hash, duration FROM interactions ORDER BY seq'):
+            self._index.setdefault((method, path_, body_hash), deque()).append((seq, duration))
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'server_url'").fetchone()
+        self.server_url = row[0] if row else 'http://replay.invalid'
+        self.replayed = 0
+
+    def send(self, method, url, body=None, headers=None, stream=False):
+        key = _request_key(method, url, body, headers)
+        with self._lock:
+            recorded = self._index.get(key)
+            if not recorded:
+                raise LookupError(
+                    f"Request not found in cassette {self.path}: {key[0]} {key[1]}\n"
+                    f"→ Record the cassette again if the script or its configuration changed."
+                )
+            seq, duration = recorded.popleft() if len(recorded) > 1 else recorded[0]
+            status, reason, headers_json, content = self._db.execute(
+                'SELECT status, reason, headers, body FROM interactions WHERE seq = ?',
+                (seq,)).fetchone()
+            self.replayed += 1
+
+        if self.timing == 'original' and duration:
+            time.sleep(duration / self.speed)
+
+        content = zlib.decompress(content)
+        response_headers = json.loads(headers_json)
+        if stream and 200 <= status < 300 and status != 204:
+            return TransportResponse(status, reason, response_headers, None,
+                                     stream=io.BytesIO(content))
+        return TransportResponse(status, reason, response_headers, content)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def replay_session(path, timing='original', speed=1.0, **session_options):
+    """
+    Create a SciNoteSession that answers all requests from a cassette.
+
+    No credential file or network access is needed: the session gets
+    placeholder credentials that never expire, in a temporary file that is
+    removed together with the session (or when the program exits).
+
+    Args:
+        path (str or Path): Cassette file
+        timing (str): 'original' or 'fast' (see ReplayTransport)
+        speed (float): Replay speed factor for timing='original'
+        **session_options: Further SciNoteSession options (e.g. codec)
+    """
+    transport = ReplayTransport(path, timing, speed)
+    credentials = {
+        'server_url': transport.server_url,
+        'api_uid': 'replay', 'api_secret': 'replay',
+        'access_token': 'replay', 'refresh_token': 'replay',
+        'access_token_created_at': int(time.time()),
+        'access_token_expires_in': 10 * 365 * 24 * 3600,
+    }
+    directory = tempfile.mkdtemp(prefix='scinote_replay_')
+    cred_file = Path(directory) / 'api_credentials_replay.json'
+    cred_file.write_text(json.dumps(credentials))
+    session = SciNoteSession(cred_file, transport=transport, **session_options)
+    weakref.finalize(session, shutil.rmtree, directory, ignore_errors=True)
+    return session
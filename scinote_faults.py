@@ -0,0 +1,252 @@
+"""
+SciNote API Client - Fault Injection
+
+A transport wrapper that makes the server look slow or unreliable, to test
+how scripts behave under bad conditions: added latency, error responses
+(429/500/503), connection resets and bodies cut off mid-transfer. Faults
+are picked at random with given probabilities or at fixed request numbers,
+and a seed makes a run repeatable.
+
+Usage:
+    from scinote_api import SciNoteSession, set_default_session
+    from scinote_faults import FaultInjectingTransport, lognormal_latency
+
+    set_default_session(SciNoteSession(transport=FaultInjectingTransport(
+        seed=42,
+        latency=lognormal_latency(median=0.08, sigma=0.6),
+        error_rate=0.05,          # 5% of requests answered with 429, 500 or 503
+        reset_rate=0.01,          # 1% of connections reset
+        schedule={10: 503},       # The 10th request always gets a 503
+    )))
+
+Without changing a script, faults can be enabled with the SCINOTE_FAULTS
+environment variable, which holds the arguments as JSON:
+
+    SCINOTE_FAULTS='{"seed": 42, "error_rate": 0.05, "latency": {"lognormal": [0.08, 0.6]}}' \\
+        python3 templates/08_advanced/export_project_data.py
+
+Faults apply to requests sent through SciNoteSession's transport; the
+asyncio client uses its own connections and is not affected.
+"""
+
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from urllib.error import URLError
+
+from scinote_api import TransportResponse, default_transport
+
+
+# === Latency Distributions ===
+
+def fixed_latency(seconds):
+    """Always wait the same time."""
+    return lambda rng: seconds
+
+
+def uniform_latency(low, high):
+    """Wait a random time between low and high seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def exponential_latency(mean):
+    """Wait a random time with exponential distribution (many short, some long waits)."""
+    return lambda rng: rng.expovariate(1 / mean)
+
+
+def lognormal_latency(median, sigma=0.5):
+    """
+    Wait a random time with log-normal distribution, typical for server latency.
+
+    Args:
+        median (float): Median wait in seconds
+        sigma (float): Spread; larger values give a longer tail (0.5 -> p99 ~ 3x median)
+    """
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+LATENCY_DISTRIBUTIONS = {
+    'fixed': fixed_latency,
+    'uniform': uniform_latency,
+    'exponential': exponential_latency,
+    'lognormal': lognormal_latency,
+}
+
+
+# === Transport ===
+
+FAULT_KINDS = ('error', 'reset', 'truncate')
+
+_REASONS = {429: 'Too Many Requests', 500: 'Internal Server Error',
+            502: 'Bad Gateway', 503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+
+class FaultInjectingTransport:
+    """
+    Wraps a transport and injects latency and failures into its requests.
+
+    For each request, one random number decides whether a fault happens
+    (error, reset or truncate, with the given rates); the `schedule` takes
+    precedence for the request numbers it lists. With the same seed and the
+    same order of requests, the same faults are injected. Requests sent from
+    several threads at once may be numbered in a different order each run.
+
+    Faults:
+        error: The request is not sent; a response with one of
+            `error_statuses` is returned (with Retry-After for 429 and 503).
+        reset: The request is not sent; the connection fails like a reset
+            by the server.
+        truncate: The request is sent, but the connection breaks after part
+            of the response body was received.
+
+    Args:
+        transport (optional): The wrapped transport. Defaults to default_transport().
+        seed (int, optional): Seed for all random decisions.
+        latency (callable or float, optional): Extra wait before each request,
+            in seconds, or a distribution like lognormal_latency(0.05).
+        error_rate (float): Probability of an error response.
+        error_statuses (tuple): Status codes used for error responses.
+        reset_rate (float): Probability of a connection reset.
+        truncate_rate (float): Probability of a truncated response body.
+        retry_after (float, optional): Retry-After seconds sent with 429 and 503.
+        schedule (dict, optional): Request number (starting at 1) mapped to a
+            fault: a status code, 'reset', 'truncate' or 'ok' (no fault).
+    """
+
+    def __init__(self, transport=None, seed=None, latency=None, error_rate=0.0,
+                 error_statuses=(429, 500, 503), reset_rate=0.0, truncate_rate=0.0,
+                 retry_after=1, schedule=None):
+        self.transport = transport or default_transport()
+        self.latency = fixed_latency(latency) if isinstance(latency, (int, float)) else latency
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.reset_rate = reset_rate
+        self.truncate_rate = truncate_rate
+        self.retry_after = retry_after
+        self.schedule = {int(number): fault for number, fault in (schedule or {}).items()}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self.injected = {'requests': 0, 'delayed_seconds': 0.0, 'error': 0, 'reset': 0,
+                         'truncate': 0}
+
+    @classmethod
+    def from_spec(cls, spec, transport=None):
+        """
+        Create a transport from a JSON string or dict of constructor arguments.
+
+        A latency may be given as {"<distribution>": [arguments]}, e.g.
+        {"lognormal": [0.08, 0.6]} (see LATENCY_DISTRIBUTIONS).
+        """
+        options = json.loads(spec) if isinstance(spec, str) else dict(spec)
+        latency = options.get('latency')
+        if isinstance(latency, dict):
+            (name, arguments), = latency.items()
+            if name not in LATENCY_DISTRIBUTIONS:
+                raise ValueError(
+                    f"Unknown latency distribution '{name}'.\n"
+                    f"→ Use one of: {', '.join(LATENCY_DISTRIBUTIONS)}"
+                )
+            arguments = arguments if isinstance(arguments, list) else [arguments]
+            options['latency'] = LATENCY_DISTRIBUTIONS[name](*arguments)
+        return cls(transport=transport, **options)
+
+    def _plan(self):
+        """Decide delay and fault of the next request."""
+        with self._lock:
+            self._requests += 1
+            number = self._requests
+            delay = max(0.0, self.latency(self._rng)) if self.latency else 0.0
+            draw = self._rng.random()
+            status = self._rng.choice(self.error_statuses) if self.error_statuses else 500
+            cut = self._rng.random()
+
+            fault = self.schedule.get(number)
+            if isinstance(fault, int):
+                fault, status = 'error', fault
+            elif fault is None:
+                if draw < self.error_rate:
+                    fault = 'error'
+                elif draw < self.error_rate + self.reset_rate:
+                    fault = 'reset'
+                elif draw < self.error_rate + self.reset_rate + self.truncate_rate:
+                    fault = 'truncate'
+            elif fault == 'ok':
+                fault = None
+            elif fault not in FAULT_KINDS:
+                raise ValueError(f"Unknown fault '{fault}' in schedule.\n"
+                                 f"→ Use a status code, 'reset', 'truncate' or 'ok'")
+
+            self.injected['requests'] += 1
+            self.injected['delayed_seconds'] += delay
+            if fault:
+                self.injected[fault] += 1
+        return delay, fault, status, cut
+
+    def send(self, method, url, body=None, headers=None, stream=False):
+        delay, fault, status, cut = self._plan()
+        if delay:
+            time.sleep(delay)
+
+        if fault == 'error':
+            response_headers = {'content-type': 'application/json'}
+            if status in (429, 503) and self.retry_after is not None:
+                response_headers['retry-after'] = str(self.retry_after)
+            payload = json.dumps({'errors': [{'status': str(status),
+                                              'title': 'Injected fault'}]}).encode('utf-8')
+            return TransportResponse(status, _REASONS.get(status, 'Error'), response_headers,
+                                     payload)
+        if fault == 'reset':
+            raise URLError(ConnectionResetError(104, 'Connection reset by peer (injected)'))
+
+        # Only pass stream to the wrapped transport when needed
+        if stream:
+            response = self.transport.send(method, url, body=body, headers=headers, stream=True)
+        else:
+            response = self.transport.send(method, url, body=body, headers=headers)
+
+        if fault == 'truncate':
+            if response.stream is not None:
+                # Cut within the announced length, or the first 64 KB if unknown
+                length = int(response.headers.get('content-length') or 64 * 1024)
+                response.stream = _TruncatedStream(response.stream, int(length * cut))
+            elif response.body:
+                partial = response.body[:int(len(response.body) * cut)]
+                raise URLError(http.client.IncompleteRead(
+                    partial, len(response.body) - len(partial)))
+        return response
+
+    def summary(self):
+        """Return the number of requests and of each injected fault."""
+        with self._lock:
+            return dict(self.injected)
+
+    def close(self):
+        self.transport.close()
+
+
+class _TruncatedStream:
+    """Streamed body that breaks off like a dropped connection."""
+
+    def __init__(self, stream, limit):
+        self._stream = stream
+        self._received = 0
+        self._limit = limit
+
+    def read(self, size=-1):
+        if self._received >= self._limit:
+            self.close()
+            raise URLError(http.client.IncompleteRead(b''))
+        data = self._stream.read(size)
+        if not data:
+            return data
+        data = data[:self._limit - self._received]
+        self._received += len(data)
+        return data
+
+    def close(self):
+        self._stream.close()
@@ -0,0 +1,288 @@
+"""
+SciNote API Client - Request Metrics
+
+Collects statistics about the requests a script makes: how often each
+endpoint is called, how long the calls take (p50/p95/p99), how many bytes
+are transferred, which status codes come back, and how often requests are
+retried or the token is refreshed.
+
+Endpoints are grouped by template - IDs in the path are replaced by {id}, so
+/api/v1/teams/1/projects/5 and /api/v1/teams/1/projects/6 are counted
+together as /api/v1/teams/{id}/projects/{id}.
+
+Usage:
+    from scinote_metrics import enable_metrics
+
+    metrics = enable_metrics('scinote_metrics.json')   # or 'scinote_metrics.prom'
+
+    # ... run api_request() calls as usual ...
+    # The metrics are written to the file when the script exits.
+
+The .prom file is in the Prometheus text format, e.g. for the node
+exporter's textfile collector.
+"""
+
+import atexit
+import json
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from scinote_api import RequestHook, get_default_session
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_ID_SEGMENT = re.compile(
+    r'^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$', re.IGNORECASE)
+
+
+def endpoint_template(endpoint):
+    """
+    Return the endpoint path with IDs replaced by {id} and without query string.
+
+    Example:
+        endpoint_template('/api/v1/teams/1/projects/5?page[size]=100')
+        # -> '/api/v1/teams/{id}/projects/{id}'
+    """
+    path = endpoint.split('?', 1)[0]
+    return '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment
+                    for segment in path.split('/'))
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations with fixed buckets.
+
+    Memory use does not grow with the number of requests. Percentiles are
+    estimated by interpolating within the bucket they fall into.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # Last one: above all buckets
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Estimate the q-quantile (0 < q < 1), or None without observations."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / count
+                return min(estimate, self.max)
+            cumulative += count
+        return self.max
+
+    def summary(self):
+        return {
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'mean': self.sum / self.count if self.count else None,
+            'max': self.max,
+        }
+
+
+class _EndpointStats:
+    __slots__ = ('latency', 'statuses', 'bytes_sent', 'bytes_received', 'retries')
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.statuses = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+
+
+class MetricsCollector(RequestHook):
+    """
+    Request hook that keeps latency histograms and counters per endpoint template.
+
+    Every attempt counts as a request, so a retried request shows up once
+    per attempt. Connection errors are counted with status 'error'.
+
+    Usage:
+        metrics = MetricsCollector()
+        session = SciNoteSession(hooks=[metrics])
+        ...
+        print(metrics.to_json())
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}   # (method, template) -> _EndpointStats
+        self._token_refreshes = LatencyHistogram()
+        self._started = time.time()
+
+    def _stats(self, method, endpoint):
+        key = (method.upper(), endpoint_template(endpoint))
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = _EndpointStats()
+        return stats
+
+    # --- Hook methods ---
+
+    def after_request(self, method, endpoint, attempt, duration, status,
+                      bytes_sent, bytes_received, error):
+        status = str(status) if status is not None else 'error'
+        with self._lock:
+            stats = self._stats(method, endpoint)
+            stats.latency.observe(duration)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+
+    def on_retry(self, method, endpoint, attempt, delay, status, error):
+        with self._lock:
+            self._stats(method, endpoint).retries += 1
+
+    def on_token_refresh(self, duration):
+        with self._lock:
+            self._token_refreshes.observe(duration)
+
+    # --- Output ---
+
+    def to_dict(self):
+        """Return all metrics as a dict (latencies in seconds)."""
+        with self._lock:
+            endpoints = [
+                {
+                    'method': method,
+                    'endpoint': template,
+                    'requests': stats.latency.count,
+                    'retries': stats.retries,
+                    'statuses': dict(sorted(stats.statuses.items())),
+                    'bytes_sent': stats.bytes_sent,
+                    'bytes_received': stats.bytes_received,
+                    'latency': stats.latency.summary(),
+                }
+                for (method, template), stats in sorted(self._endpoints.items())
+            ]
+            return {
+                'started_at': self._started,
+                'duration': time.time() - self._started,
+                'endpoints': endpoints,
+                'token_refreshes': {
+                    'count': self._token_refreshes.count,
+                    'total_seconds': self._token_refreshes.sum,
+                },
+            }
+
+    def to_json(self):
+        """Return all metrics as a JSON string."""
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        with self._lock:
+            items = sorted(self._endpoints.items())
+
+            metric('scinote_request_duration_seconds', 'histogram',
+                   'Duration of SciNote API requests.')
+            for (method, template), stats in items:
+                labels = _labels(method=method, endpoint=template)
+                cumulative = 0
+                for bound, count in zip(stats.latency.buckets, stats.latency.counts):
+                    cumulative += count
+                    lines.append(f'scinote_request_duration_seconds_bucket'
+                                 f'{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'scinote_request_duration_seconds_bucket'
+                             f'{{{labels},le="+Inf"}} {stats.latency.count}')
+                lines.append(f'scinote_request_duration_seconds_sum{{{labels}}} '
+                             f'{stats.latency.sum}')
+                lines.append(f'scinote_request_duration_seconds_count{{{labels}}} '
+                             f'{stats.latency.count}')
+
+            metric('scinote_requests_total', 'counter',
+                   'SciNote API requests by status code.')
+            for (method, template), stats in items:
+                for status, count in sorted(stats.statuses.items()):
+                    labels = _labels(method=method, endpoint=template, status=status)
+                    lines.append(f'scinote_requests_total{{{labels}}} {count}')
+
+            for name, attribute, help_text in (
+                    ('scinote_request_bytes_sent_total', 'bytes_sent',
+                     'Request body bytes sent.'),
+                    ('scinote_response_bytes_received_total', 'bytes_received',
+                     'Response body bytes received (as transferred).'),
+                    ('scinote_retries_total', 'retries', 'Retried requests.')):
+                metric(name, 'counter', help_text)
+                for (method, template), stats in items:
+                    labels = _labels(method=method, endpoint=template)
+                    lines.append(f'{name}{{{labels}}} {getattr(stats, attribute)}')
+
+            metric('scinote_token_refreshes_total', 'counter', 'Access token refreshes.')
+            lines.append(f'scinote_token_refreshes_total {self._token_refreshes.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path, format=None):
+        """
+        Write the metrics to a file.
+
+        Args:
+            path (str or Path): Output file
+            format (str, optional): 'json' or 'prometheus'. By default
+                files ending in .prom or .txt get the Prometheus format.
+        """
+        path = str(path)
+        if format is None:
+            format = 'prometheus' if path.endswith(('.prom', '.txt')) else 'json'
+        if format not in ('json', 'prometheus'):
+            raise ValueError(f"Unknown metrics format '{format}'.\n"
+                             f"→ Use 'json' or 'prometheus'")
+        text = self.to_prometheus() if format == 'prometheus' else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def dump_at_exit(self, path, format=None):
+        """Write the metrics to a file when the script exits (see dump())."""
+        atexit.register(self.dump, path, format)
+
+
+def _labels(**labels):
+    """Format Prometheus labels, escaping backslashes, quotes and newlines."""
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+def enable_metrics(path=None, format=None, session=None):
+    """
+    Collect metrics for all requests of a session (the default session of
+    api_request() unless given).
+
+    Args:
+        path (str or Path, optional): Write the metrics to this file at exit
+        format (str, optional): 'json' or 'prometheus' (see MetricsCollector.dump())
+        session (SciNoteSession, optional): Session to instrument
+
+    Returns:
+        MetricsCollector: The collector, for reading metrics while the script runs
+    """
+    collector = MetricsCollector()
+    (session or get_default_session()).add_hook(collector)
+    if path is not None:
+        collector.dump_at_exit(path, format)
+    return collector
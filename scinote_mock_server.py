@@ -0,0 +1,738 @@
+"""
+SciNote API Client - Local Mock Server
+
+A stand-in for a SciNote server that runs on your own computer, for trying
+out scripts and measuring performance without touching real data. It serves
+the /api/v1 endpoints used by the templates (teams, projects, experiments,
+tasks, protocols and steps, results, inventories and items) and /oauth/token,
+with JSON:API pagination, include=, sparse fieldsets, ETags and gzip.
+
+The data is synthetic and generated from a seed, by default 1 team with
+10 projects x 10 experiments x 100 tasks = 10,000 tasks. Results, protocol
+steps and inventory items are generated when first requested. Changes made
+with POST/PATCH/DELETE are kept in memory until the server stops.
+
+Usage:
+    # Start a server and write a matching credential file
+    python3 scinote_mock_server.py --port 8765 --credentials api_credentials_mock.json
+
+    # Simulate a slow server: 50 ms +/- 20 ms per request
+    python3 scinote_mock_server.py --latency 0.05 --jitter 0.02
+
+    # From Python (e.g. in benchmarks)
+    from scinote_mock_server import MockSciNoteServer
+
+    with MockSciNoteServer(latency=0.01) as server:
+        cred_file = server.write_credentials('/tmp/api_credentials_mock.json')
+        session = SciNoteSession(cred_file)
+
+IDs are numbered per type: project 1 holds experiments 1-10, experiment 1
+holds tasks 1-100, and so on. Set the IDs in a template's CONFIGURATION to
+matching values before running it against the mock server.
+
+Note: templates use the newest api_credentials_*.json file they find, and
+'api_credentials_mock.json' sorts after the dated files downloaded from
+SciNote. Delete it when you are done.
+"""
+
+import argparse
+import gzip
+import hashlib
+import itertools
+import json
+import random
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, quote, urlsplit
+
+# Collection name in the URL -> resource type
+COLLECTION_TYPES = {
+    'teams': 'teams',
+    'projects': 'projects',
+    'experiments': 'experiments',
+    'tasks': 'tasks',
+    'results': 'results',
+    'protocols': 'protocols',
+    'steps': 'protocol_steps',
+    'inventories': 'inventories',
+    'items': 'inventory_items',
+}
+
+# Resource type -> collections nested below it
+NESTED_COLLECTIONS = {
+    None: ('teams',),
+    'teams': ('projects', 'inventories'),
+    'projects': ('experiments',),
+    'experiments': ('tasks',),
+    'tasks': ('results', 'protocols'),
+    'protocols': ('steps',),
+    'inventories': ('items',),
+}
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _timestamp(rng):
+    moment = _EPOCH + timedelta(seconds=rng.randrange(2 * 365 * 24 * 3600))
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+# === Synthetic Data ===
+
+class MockDataset:
+    """
+    Synthetic, deterministic SciNote data.
+
+    Teams, projects, experiments, tasks and inventories are created up front;
+    results, protocols, protocol steps and inventory items (with their cells)
+    are generated the first time their parent is listed. The same seed always
+    produces the same data and IDs.
+
+    Args:
+        teams (int): Number of teams.
+        projects (int): Projects per team.
+        experiments_per_project (int): Experiments per project.
+        tasks_per_experiment (int): Tasks per experiment.
+        results_per_task (int): Results per task.
+        steps_per_protocol (int): Steps of each task protocol.
+        inventories (int): Inventories per team.
+        items_per_inventory (int): Items per inventory.
+        inventory_columns (int): Custom columns (cells) per inventory item.
+        seed (int): Seed of the random data.
+    """
+
+    def __init__(self, teams=1, projects=10, experiments_per_project=10,
+                 tasks_per_experiment=100, results_per_task=2, steps_per_protocol=5,
+                 inventories=2, items_per_inventory=2000, inventory_columns=10, seed=1):
+        self.results_per_task = results_per_task
+        self.steps_per_protocol = steps_per_protocol
+        self.items_per_inventory = items_per_inventory
+        self.inventory_columns = inventory_columns
+        self.seed = seed
+        self._resources = {}   # type -> {id: resource}
+        self._children = {}    # (parent type, parent id, collection) -> {id: None}
+        self._lock = threading.RLock()
+
+        rng = random.Random(seed)
+        for team_id in self._ids('teams', 0, teams):
+            self._add('teams', team_id, None, {
+                'name': f'Team {team_id}',
+                'description': 'Synthetic team of the mock server',
+                'space_taken': rng.randrange(10 ** 9),
+                'created_at': _timestamp(rng),
+                'updated_at': _timestamp(rng),
+            })
+            for inventory_id in self._ids('inventories', (team_id - 1) * inventories,
+                                          inventories):
+                self._add('inventories', inventory_id, ('teams', team_id), {
+                    'name': f'Inventory {inventory_id}',
+                    'created_at': _timestamp(rng),
+                    'updated_at': _timestamp(rng),
+                })
+            for project_id in self._ids('projects', (team_id - 1) * projects, projects):
+                self._add('projects', project_id, ('teams', team_id), {
+                    'name': f'Project {project_id}',
+                    'description': 'Synthetic project. ' * rng.randint(1, 3),
+                    'visibility': rng.choice(['visible', 'hidden']),
+                    'archived': rng.random() < 0.1,
+                    'start_date': _timestamp(rng),
+                    'created_at': _timestamp(rng),
+                    'updated_at': _timestamp(rng),
+                })
+                for experiment_id in self._ids('experiments',
+                                               (project_id - 1) * experiments_per_project,
+                                               experiments_per_project):
+                    self._add('experiments', experiment_id, ('projects', project_id), {
+                        'name': f'Experiment {experiment_id}',
+                        'description': 'Synthetic experiment. ' * rng.randint(1, 3),
+                        'status': rng.choice(['not_started', 'in_progress', 'done']),
+                        'archived': rng.random() < 0.1,
+                        'created_at': _timestamp(rng),
+                        'updated_at': _timestamp(rng),
+                    })
+                    for task_id in self._ids('tasks',
+                                             (experiment_id - 1) * tasks_per_experiment,
+                                             tasks_per_experiment):
+                        self._add('tasks', task_id, ('experiments', experiment_id),
+                                  self._task_attributes(task_id, rng))
+
+        # Number of generated resources per type. Lazily generated resources
+        # get IDs derived from their parent's ID, so created resources get
+        # IDs above the whole generated range.
+        tasks = self.task_count
+        items = teams * inventories * items_per_inventory
+        self._generated = {
+            'teams': teams, 'projects': teams * projects,
+            'experiments': teams * projects * experiments_per_project,
+            'tasks': tasks, 'results': tasks * results_per_task, 'protocols': tasks,
+            'protocol_steps': tasks * steps_per_protocol, 'inventories': teams * inventories,
+            'inventory_items': items, 'inventory_cells': items * inventory_columns,
+        }
+        self._next_ids = {resource_type: itertools.count(count + 1)
+                          for resource_type, count in self._generated.items()}
+
+    @property
+    def task_count(self):
+        return len(self._resources.get('tasks', ()))
+
+    def _ids(self, resource_type, offset, count):
+        """IDs of `count` generated resources following `offset`."""
+        return range(offset + 1, offset + count + 1)
+
+    def _add(self, resource_type, resource_id, parent, attributes, relationships=None):
+        resource = {'id': str(resource_id), 'type': resource_type, 'attributes': attributes}
+        if relationships:
+            resource['relationships'] = relationships
+        self._resources.setdefault(resource_type, {})[resource['id']] = resource
+        if parent is not None:
+            key = (parent[0], str(parent[1]), _collection_of(resource_type))
+            self._children.setdefault(key, {})[resource['id']] = None
+        return resource
+
+    def _task_attributes(self, task_id, rng):
+        state = rng.choice(['uncompleted', 'in_progress', 'completed'])
+        return {
+            'name': f'Task {task_id} - sample preparation',
+            'description': 'Prepare samples according to SOP. ' * rng.randint(1, 4),
+            'state': state,
+            'status_name': {'uncompleted': 'Not started', 'in_progress': 'In progress',
+                            'completed': 'Completed'}[state],
+            'archived': False,
+            'started_on': _timestamp(rng),
+            'completed_on': _timestamp(rng) if state == 'completed' else None,
+            'due_date': _timestamp(rng),
+            'created_at': _timestamp(rng),
+            'updated_at': _timestamp(rng),
+            'x': rng.randrange(2000),
+            'y': rng.randrange(2000),
+        }
+
+    def _generate(self, parent_type, parent_id, collection):
+        """Create the lazily generated children of a resource."""
+        parent_number = int(parent_id)
+        if parent_number > self._generated[parent_type]:
+            return   # Created through the API - starts out empty
+        rng = random.Random(f'{self.seed}/{parent_type}/{parent_id}/{collection}')
+
+        if parent_type == 'tasks' and collection == 'results':
+            count = self.results_per_task
+            for result_id in range((parent_number - 1) * count + 1, parent_number * count + 1):
+                self._add('results', result_id, ('tasks', parent_id), {
+                    'name': f'Result {result_id}',
+                    'archived': False,
+                    'created_at': _timestamp(rng),
+                    'updated_at': _timestamp(rng),
+                })
+        elif parent_type == 'tasks' and collection == 'protocols':
+            # Every task has exactly one protocol with the task's ID
+            steps = self._generate_steps(parent_number, rng)
+            self._add('protocols', parent_number, ('tasks', parent_id), {
+                'name': f'Protocol of task {parent_id}',
+                'description': 'Synthetic protocol',
+                'version_number': 1,
+                'created_at': _timestamp(rng),
+                'updated_at': _timestamp(rng),
+            }, {'protocol_steps': {'data': steps}})
+        elif parent_type == 'protocols' and collection == 'steps':
+            self.children('tasks', parent_id, 'protocols')
+        elif parent_type == 'inventories' and collection == 'items':
+            count = self.items_per_inventory
+            for item_id in range((parent_number - 1) * count + 1, parent_number * count + 1):
+                cells = self._generate_cells(item_id, rng)
+                self._add('inventory_items', item_id, ('inventories', parent_id), {
+                    'name': f'Plasmid pUC19-{item_id}',
+                    'archived': False,
+                    'created_at': _timestamp(rng),
+                    'updated_at': _timestamp(rng),
+                }, {'inventory_cells': {'data': cells}})
+
+    def _generate_steps(self, protocol_id, rng):
+        count = self.steps_per_protocol
+        refs = []
+        for position, step_id in enumerate(range((protocol_id - 1) * count + 1,
+                                                 protocol_id * count + 1)):
+            self._add('protocol_steps', step_id, ('protocols', protocol_id), {
+                'name': f'Step {position + 1}',
+                'position': position,
+                'description': 'Centrifuge at 13,000 rpm for 1 minute. ' * rng.randint(1, 3),
+                'completed': rng.random() < 0.5,
+                'created_at': _timestamp(rng),
+                'updated_at': _timestamp(rng),
+            })
+            refs.append({'id': str(step_id), 'type': 'protocol_steps'})
+        return refs
+
+    def _generate_cells(self, item_id, rng):
+        count = self.inventory_columns
+        refs = []
+        for column, cell_id in enumerate(range((item_id - 1) * count + 1, item_id * count + 1)):
+            self._add('inventory_cells', cell_id, None, {
+                'value_type': 'RepositoryTextValue',
+                'value': f'value {rng.random():.6f}',
+                'column_id': column + 1,
+                'created_at': _timestamp(rng),
+                'updated_at': _timestamp(rng),
+            })
+            refs.append({'id': str(cell_id), 'type': 'inventory_cells'})
+        return refs
+
+    # --- Access ---
+
+    def get(self, resource_type, resource_id):
+        """Return a resource, or None."""
+        return self._resources.get(resource_type, {}).get(str(resource_id))
+
+    def children(self, parent_type, parent_id, collection):
+        """Return the IDs of a nested collection (e.g. the tasks of an experiment)."""
+        key = (parent_type, str(parent_id), collection)
+        with self._lock:
+            if key not in self._children:
+                self._generate(parent_type, str(parent_id), collection)
+                self._children.setdefault(key, {})
+            return list(self._children[key])
+
+    def contains(self, parent_type, parent_id, collection, resource_id):
+        """Check whether a resource belongs to the given parent."""
+        self.children(parent_type, parent_id, collection)
+        return str(resource_id) in self._children[(parent_type, str(parent_id), collection)]
+
+    def create(self, parent_type, parent_id, collection, attributes):
+        """Create a resource below a parent and return it."""
+        resource_type = COLLECTION_TYPES[collection]
+        with self._lock:
+            self.children(parent_type, parent_id, collection)
+            resource_id = next(self._next_ids[resource_type])
+            attributes = dict(attributes, created_at=_now(), updated_at=_now())
+            attributes.setdefault('archived', False)
+            return self._add(resource_type, resource_id, (parent_type, parent_id), attributes)
+
+    def update(self, resource_type, resource_id, attributes):
+        """Change attributes of a resource and return it."""
+        with self._lock:
+            resource = self.get(resource_type, resource_id)
+            resource['attributes'] = dict(resource['attributes'], **attributes,
+                                          updated_at=_now())
+            return resource
+
+    def delete(self, parent_type, parent_id, collection, resource_id):
+        """Remove a resource from its parent."""
+        with self._lock:
+            self._children[(parent_type, str(parent_id), collection)].pop(str(resource_id))
+            self._resources[COLLECTION_TYPES[collection]].pop(str(resource_id))
+
+
+def _collection_of(resource_type):
+    for collection, collection_type in COLLECTION_TYPES.items():
+        if collection_type == resource_type:
+            return collection
+    return resource_type
+
+
+# === HTTP Server ===
+
+class _APIError(Exception):
+    def __init__(self, status, title, detail=''):
+        super().__init__(title)
+        self.status = status
+        self.title = title
+        self.detail = detail
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Benchmarks open many connections at once - don't let the kernel drop them
+    request_queue_size = 1024
+
+
+class MockSciNoteServer:
+    """
+    Local HTTP server answering like the SciNote API.
+
+    Each request is handled in its own thread; connections are kept alive.
+
+    Args:
+        dataset (MockDataset, optional): The data to serve. Defaults to MockDataset().
+        host (str): Address to listen on.
+        port (int): Port to listen on (0 picks a free port).
+        latency (float): Seconds to wait before answering each request.
+        jitter (float): Additional random wait of up to this many seconds.
+        require_auth (bool): Reject requests without a valid access token
+            (tokens are issued by /oauth/token and write_credentials()).
+        token_lifetime (int): Lifetime of issued access tokens in seconds.
+        compression (bool): Gzip responses when the client accepts it.
+        seed (int): Seed of the latency jitter.
+    """
+
+    def __init__(self, dataset=None, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 require_auth=True, token_lifetime=7200, compression=True, seed=None):
+        self.dataset = dataset or MockDataset()
+        self.latency = latency
+        self.jitter = jitter
+        self.require_auth = require_auth
+        self.token_lifetime = token_lifetime
+        self.compression = compression
+        self.client_id = 'mock-client'
+        self.client_secret = 'mock-secret'
+        self._rng = random.Random(seed)
+        self._tokens = {}          # access token -> expiry time
+        self._refresh_tokens = set()
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'token_requests': 0, 'bytes_sent': 0,
+                          'not_modified': 0, 'errors': 0}
+        self._server = _HTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='scinote-mock-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve requests in the current thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # --- Tokens ---
+
+    def issue_token(self):
+        """Create a new access and refresh token pair (OAuth token response)."""
+        access_token, refresh_token = secrets.token_hex(16), secrets.token_hex(16)
+        created_at = int(time.time())
+        with self._lock:
+            self._tokens[access_token] = created_at + self.token_lifetime
+            self._refresh_tokens.add(refresh_token)
+            self._counters['token_requests'] += 1
+        return {'access_token': access_token, 'refresh_token': refresh_token,
+                'token_type': 'Bearer', 'expires_in': self.token_lifetime,
+                'created_at': created_at}
+
+    def credentials(self):
+        """Return credentials (as in a SciNote credential file) for this server."""
+        token = self.issue_token()
+        return {
+            'server_url': self.url,
+            'api_uid': self.client_id,
+            'api_secret': self.client_secret,
+            'api_redirect_uri': 'urn:ietf:wg:oauth:2.0:oob',
+            'access_token': token['access_token'],
+            'refresh_token': token['refresh_token'],
+            'access_token_created_at': token['created_at'],
+            'access_token_expires_in': token['expires_in'],
+        }
+
+    def write_credentials(self, path='api_credentials_mock.json'):
+        """Write a credential file for this server and return its path."""
+        path = Path(path)
+        path.write_text(json.dumps(self.credentials(), indent=2))
+        return path
+
+    def _token_is_valid(self, authorization):
+        if not self.require_auth:
+            return True
+        token = (authorization or '').partition('Bearer ')[2]
+        with self._lock:
+            return self._tokens.get(token, 0) > time.time()
+
+    def stats(self):
+        """Return request counters."""
+        with self._lock:
+            return dict(self._counters)
+
+    def _count(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                self._counters[name] += value
+
+    # --- Requests ---
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately - send them right away
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server._handle(self, 'GET')
+
+            def do_POST(self):
+                server._handle(self, 'POST')
+
+            def do_PATCH(self):
+                server._handle(self, 'PATCH')
+
+            def do_PUT(self):
+                server._handle(self, 'PATCH')
+
+            def do_DELETE(self):
+                server._handle(self, 'DELETE')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _handle(self, handler, method):
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self._rng.uniform(0, self.jitter))
+
+        parts = urlsplit(handler.path)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        body = self._read_body(handler)
+        base_url = f"http://{handler.headers.get('Host') or self.url[len('http://'):]}"
+
+        try:
+            if parts.path == '/oauth/token' and method == 'POST':
+                status, document = 200, self._token_response(body)
+            elif parts.path == '/mock/stats':
+                status, document = 200, self.stats()
+            elif not parts.path.startswith('/api/v1/'):
+                raise _APIError(404, 'Not found', f'No route for {parts.path}')
+            elif not self._token_is_valid(handler.headers.get('Authorization')):
+                raise _APIError(401, 'Unauthorized', 'Missing, invalid or expired access token')
+            else:
+                status, document = self._api(method, parts.path, query, body, base_url)
+        except _APIError as e:
+            self._count(errors=1)
+            status, document = e.status, {'errors': [
+                {'status': str(e.status), 'title': e.title, 'detail': e.detail}]}
+
+        self._count(requests=1)
+        self._send(handler, status, document)
+
+    def _read_body(self, handler):
+        length = int(handler.headers.get('Content-Length') or 0)
+        data = handler.rfile.read(length) if length else b''
+        if data and handler.headers.get('Content-Encoding', '').lower() == 'gzip':
+            data = gzip.decompress(data)
+        return data
+
+    def _send(self, handler, status, document):
+        payload = b'' if document is None else json.dumps(document).encode('utf-8')
+        headers = {'Content-Type': 'application/vnd.api+json'}
+
+        if handler.command == 'GET' and status == 200:
+            etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+            headers['ETag'] = etag
+            if handler.headers.get('If-None-Match') == etag:
+                status, payload = 304, b''
+                self._count(not_modified=1)
+
+        accepted = handler.headers.get('Accept-Encoding', '')
+        if self.compression and 'gzip' in accepted and len(payload) > 1024:
+            payload = gzip.compress(payload, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+        self._count(bytes_sent=len(payload))
+
+    def _token_response(self, body):
+        try:
+            params = json.loads(body or b'{}')
+        except ValueError:
+            params = dict(parse_qsl(body.decode('utf-8')))
+        with self._lock:
+            known = params.get('refresh_token') in self._refresh_tokens
+            if known:
+                self._refresh_tokens.discard(params['refresh_token'])
+        if params.get('grant_type') != 'refresh_token' or not known:
+            raise _APIError(400, 'invalid_grant', 'The refresh token is invalid')
+        return self.issue_token()
+
+    def _api(self, method, path, query, body, base_url):
+        """Route a request below /api/v1. Returns (status, JSON:API document)."""
+        segments = [segment for segment in path[len('/api/v1/'):].split('/') if segment]
+        dataset = self.dataset
+
+        # Walk down the hierarchy, checking that each resource belongs to its parent
+        parent_type = parent_id = None
+        index = 0
+        while index + 1 < len(segments):
+            collection, resource_id = segments[index], segments[index + 1]
+            if collection not in NESTED_COLLECTIONS.get(parent_type, ()):
+                raise _APIError(404, 'Not found', f'No route for {path}')
+            resource_type = COLLECTION_TYPES[collection]
+            exists = (dataset.get(resource_type, resource_id) is not None if parent_type is None
+                      else dataset.contains(parent_type, parent_id, collection, resource_id))
+            if not exists:
+                raise _APIError(404, 'Not found',
+                                f"{resource_type} {resource_id} doesn't exist")
+            if index + 2 < len(segments):
+                parent_type, parent_id = resource_type, resource_id
+            index += 2
+
+        if len(segments) % 2:
+            collection = segments[-1]
+            if collection not in NESTED_COLLECTIONS.get(parent_type, ()):
+                raise _APIError(404, 'Not found', f'No route for {path}')
+            if method == 'GET':
+                ids = dataset.children(parent_type, parent_id, collection) if parent_type \
+                    else list(dataset._resources.get(COLLECTION_TYPES[collection], ()))
+                return 200, self._list(COLLECTION_TYPES[collection], ids, path, query, base_url)
+            if method == 'POST' and parent_type is not None:
+                attributes = self._attributes(body)
+                resource = dataset.create(parent_type, parent_id, collection, attributes)
+                return 201, {'data': resource}
+            raise _APIError(405, 'Method not allowed')
+
+        collection, resource_id = segments[-2], segments[-1]
+        resource_type = COLLECTION_TYPES[collection]
+        if method == 'GET':
+            resource = dataset.get(resource_type, resource_id)
+            return 200, self._document(resource, query)
+        if method == 'PATCH':
+            resource = dataset.update(resource_type, resource_id, self._attributes(body))
+            return 200, {'data': resource}
+        if method == 'DELETE' and parent_type is not None:
+            dataset.delete(parent_type, parent_id, collection, resource_id)
+            return 204, None
+        raise _APIError(405, 'Method not allowed')
+
+    def _attributes(self, body):
+        try:
+            data = json.loads(body)['data']
+            return dict(data.get('attributes') or {})
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise _APIError(400, 'Bad request', "Expected a JSON:API document with 'data'")
+
+    def _list(self, resource_type, ids, path, query, base_url):
+        try:
+            size = min(int(query.get('page[size]', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+            number = int(query.get('page[number]', 1))
+        except ValueError:
+            raise _APIError(400, 'Bad request', 'page[size] and page[number] must be numbers')
+        size, number = max(size, 1), max(number, 1)
+        last = max(1, (len(ids) + size - 1) // size)
+        page_ids = ids[(number - 1) * size:number * size]
+        resources = [self.dataset.get(resource_type, resource_id) for resource_id in page_ids]
+
+        other_params = [(name, value) for name, value in query.items()
+                        if name not in ('page[size]', 'page[number]')]
+
+        def link(page):
+            params = other_params + [('page[number]', page), ('page[size]', size)]
+            encoded = '&'.join(f"{quote(str(name), safe='')}={quote(str(value), safe=',')}"
+                               for name, value in params)
+            return f'{base_url}{path}?{encoded}'
+
+        document = self._document(resources, query)
+        document['links'] = {
+            'self': link(number),
+            'first': link(1),
+            'prev': link(number - 1) if number > 1 else None,
+            'next': link(number + 1) if number < last else None,
+            'last': link(last),
+        }
+        return document
+
+    def _document(self, data, query):
+        """Build a document with sparse fieldsets and included resources applied."""
+        fields = {name[len('fields['):-1]: set(value.split(','))
+                  for name, value in query.items()
+                  if name.startswith('fields[') and name.endswith(']')}
+
+        def render(resource):
+            allowed = fields.get(resource['type'])
+            if allowed is None:
+                return resource
+            return dict(resource, attributes={name: value
+                                              for name, value in resource['attributes'].items()
+                                              if name in allowed})
+
+        included = []
+        seen = set()
+        relationships = [name for name in query.get('include', '').split(',') if name]
+        for resource in data if isinstance(data, list) else [data]:
+            for name in relationships:
+                linkage = (resource.get('relationships') or {}).get(name, {}).get('data') or []
+                for ref in linkage if isinstance(linkage, list) else [linkage]:
+                    key = (ref['type'], ref['id'])
+                    related = self.dataset.get(*key)
+                    if related is not None and key not in seen:
+                        seen.add(key)
+                        included.append(render(related))
+
+        document = {'data': [render(r) for r in data] if isinstance(data, list) else render(data)}
+        if included:
+            document['included'] = included
+        return document
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local mock SciNote API server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--projects', type=int, default=10, help='Projects per team')
+    parser.add_argument('--experiments', type=int, default=10, help='Experiments per project')
+    parser.add_argument('--tasks', type=int, default=100, help='Tasks per experiment')
+    parser.add_argument('--items', type=int, default=2000, help='Items per inventory')
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the synthetic data')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds to wait before each response')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Additional random wait of up to this many seconds')
+    parser.add_argument('--no-auth', action='store_true', help='Accept any access token')
+    parser.add_argument('--no-compression', action='store_true', help="Don't gzip responses")
+    parser.add_argument('--credentials', metavar='PATH',
+                        help='Write a credential file for this server')
+    args = parser.parse_args()
+
+    dataset = MockDataset(projects=args.projects, experiments_per_project=args.experiments,
+                          tasks_per_experiment=args.tasks, items_per_inventory=args.items,
+                          seed=args.seed)
+    server = MockSciNoteServer(dataset, args.host, args.port, latency=args.latency,
+                               jitter=args.jitter, require_auth=not args.no_auth,
+                               compression=not args.no_compression)
+    if args.credentials:
+        print(f"✓ Credentials written to {server.write_credentials(args.credentials)}")
+    print(f"✓ Mock SciNote server with {dataset.task_count} tasks on {server.url}")
+    print("  Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
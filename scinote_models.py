@@ -0,0 +1,284 @@
+"""
+SciNote API Client - Compact Resource Objects
+
+The API returns every resource as nested dicts:
+
+    task['attributes'].get('name')
+
+That is convenient, but dicts take a lot of memory when you keep tens of
+thousands of tasks, results or inventory items around for a report. The
+classes in this module store only the attributes you typically need, in
+__slots__, and convert timestamps to datetime objects only when you first
+access them.
+
+Usage:
+    from scinote_api import iter_resources
+    from scinote_models import Task
+
+    tasks = [Task.from_json(t) for t in iter_resources(endpoint)]
+    for task in tasks:
+        print(task.id, task.name, task.created_at.year)
+
+    # Or pick the class from the resource type automatically:
+    from scinote_models import load
+    resource = load(response['data'])
+
+Responses requested with ?include= carry related resources in a separate
+`included` list. Document indexes them once, so relationships are looked
+up directly instead of searching the list each time:
+
+    from scinote_models import Document
+
+    document = Document(api_request('GET', f'{protocol_endpoint}?include=protocol_steps'))
+    for step in document.protocol_steps():
+        print(step['attributes']['position'], step['attributes']['name'])
+"""
+
+import sys
+from datetime import datetime
+
+# Strings up to this length (e.g. states and status names) are interned, so
+# thousands of resources share a single copy of each value
+_INTERN_MAX_LENGTH = 32
+
+
+def _compact(value):
+    if isinstance(value, str) and len(value) <= _INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _parse_timestamp(value):
+    """Parse an API timestamp ('2025-12-03T10:23:51.000Z' or '2025-12-03')."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return value
+
+
+class _LazyTimestamp:
+    """Attribute holding the raw timestamp string until it is first read."""
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if isinstance(value, str):
+            value = _parse_timestamp(value)
+            setattr(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
+
+
+class Resource:
+    """
+    Base class of the compact resource objects.
+
+    Subclasses list the attributes they keep in FIELDS (stored as they come
+    from the API) and TIMESTAMPS (decoded to datetime on first access).
+    Attributes that are not listed are dropped.
+    """
+
+    TYPE = None
+    FIELDS = ()
+    TIMESTAMPS = ()
+    __slots__ = ('id',)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in cls.TIMESTAMPS:
+            setattr(cls, name, _LazyTimestamp('_' + name))
+
+    @classmethod
+    def from_json(cls, resource):
+        """
+        Create an object from a JSON:API resource dict.
+
+        Args:
+            resource (dict): A resource from response['data'] or response['included']
+        """
+        obj = cls.__new__(cls)
+        obj.id = resource['id']
+        attributes = resource.get('attributes') or {}
+        for name in cls.FIELDS:
+            setattr(obj, name, _compact(attributes.get(name)))
+        for name in cls.TIMESTAMPS:
+            setattr(obj, '_' + name, attributes.get(name))
+        return obj
+
+    def to_dict(self):
+        """Return the kept attributes as a plain dict (timestamps as datetime)."""
+        data = {'id': self.id, 'type': self.TYPE}
+        for name in self.FIELDS + self.TIMESTAMPS:
+            data[name] = getattr(self, name)
+        return data
+
+    def __repr__(self):
+        name = getattr(self, 'name', None)
+        return f"{type(self).__name__}(id={self.id!r}, name={name!r})"
+
+
+class Team(Resource):
+    """A team."""
+
+    TYPE = 'teams'
+    FIELDS = ('name', 'description', 'space_taken')
+    TIMESTAMPS = ('created_at', 'updated_at')
+    __slots__ = FIELDS + tuple('_' + name for name in TIMESTAMPS)
+
+
+class Project(Resource):
+    """A project of a team."""
+
+    TYPE = 'projects'
+    FIELDS = ('name', 'description', 'visibility', 'archived')
+    TIMESTAMPS = ('start_date', 'created_at', 'updated_at')
+    __slots__ = FIELDS + tuple('_' + name for name in TIMESTAMPS)
+
+
+class Experiment(Resource):
+    """An experiment of a project."""
+
+    TYPE = 'experiments'
+    FIELDS = ('name', 'description', 'status', 'archived')
+    TIMESTAMPS = ('created_at', 'updated_at')
+    __slots__ = FIELDS + tuple('_' + name for name in TIMESTAMPS)
+
+
+class Task(Resource):
+    """A task (my_module) of an experiment."""
+
+    TYPE = 'tasks'
+    FIELDS = ('name', 'description', 'state', 'status_name', 'archived', 'x', 'y')
+    TIMESTAMPS = ('started_on', 'completed_on', 'due_date', 'created_at', 'updated_at')
+    __slots__ = FIELDS + tuple('_' + name for name in TIMESTAMPS)
+
+
+class Result(Resource):
+    """A result of a task."""
+
+    TYPE = 'results'
+    FIELDS = ('name', 'archived')
+    TIMESTAMPS = ('created_at', 'updated_at')
+    __slots__ = FIELDS + tuple('_' + name for name in TIMESTAMPS)
+
+
+class InventoryItem(Resource):
+    """An item of an inventory."""
+
+    TYPE = 'inventory_items'
+    FIELDS = ('name', 'archived')
+    TIMESTAMPS = ('created_at', 'updated_at')
+    __slots__ = FIELDS + tuple('_' + name for name in TIMESTAMPS)
+
+
+class ProtocolStep(Resource):
+    """A step of a protocol."""
+
+    TYPE = 'protocol_steps'
+    FIELDS = ('name', 'position', 'description', 'completed')
+    TIMESTAMPS = ('created_at', 'updated_at')
+    __slots__ = FIELDS + tuple('_' + name for name in TIMESTAMPS)
+
+
+RESOURCE_CLASSES = {cls.TYPE: cls for cls in
+                    (Team, Project, Experiment, Task, Result, InventoryItem, ProtocolStep)}
+
+
+def load(resource):
+    """
+    Create the matching resource object for a JSON:API resource dict.
+
+    Raises:
+        ValueError: If there is no class for the resource type
+    """
+    cls = RESOURCE_CLASSES.get(resource.get('type'))
+    if cls is None:
+        raise ValueError(
+            f"No resource class for type '{resource.get('type')}'.\n"
+            f"→ Supported types: {', '.join(RESOURCE_CLASSES)}"
+        )
+    return cls.from_json(resource)
+
+
+class Document:
+    """
+    A JSON:API response with an index over its resources.
+
+    All resources of the document (`data` and `included`) are indexed by
+    (type, id) once, so looking up a resource or following a relationship
+    does not search the `included` list. Resources are returned as the
+    dicts from the response.
+
+    Args:
+        response (dict): The decoded response, as returned by api_request()
+    """
+
+    def __init__(self, response):
+        self.data = response.get('data')
+        self.included = response.get('included') or []
+        self.links = response.get('links') or {}
+        self.meta = response.get('meta') or {}
+        self._index = {}
+        self._by_type = {}
+
+        primary = self.data if isinstance(self.data, list) else [self.data] if self.data else []
+        for resource in primary + self.included:
+            key = (resource.get('type'), resource.get('id'))
+            if key not in self._index:
+                self._index[key] = resource
+                self._by_type.setdefault(key[0], []).append(resource)
+
+    def get(self, type, id):
+        """Return the resource with the given type and ID, or None."""
+        return self._index.get((type, str(id)))
+
+    def of_type(self, type):
+        """Return all resources of a type (from `data` and `included`)."""
+        return list(self._by_type.get(type, ()))
+
+    def related(self, resource, name):
+        """
+        Resolve a relationship of a resource.
+
+        Args:
+            resource (dict): A resource of this document
+            name (str): Relationship name, e.g. 'protocol_steps'
+
+        Returns:
+            list or dict or None: The related resources for to-many
+            relationships, the related resource (or None) for to-one
+            relationships. Related resources that are not part of the
+            document (not requested with ?include=) are left out.
+        """
+        linkage = ((resource.get('relationships') or {}).get(name) or {}).get('data')
+        if isinstance(linkage, list):
+            related = (self._index.get((link['type'], link['id'])) for link in linkage)
+            return [item for item in related if item is not None]
+        if linkage:
+            return self._index.get((linkage['type'], linkage['id']))
+        return None
+
+    def protocol_steps(self, protocol=None):
+        """
+        Return the steps of a protocol, ordered by position.
+
+        Args:
+            protocol (dict, optional): The protocol resource. Defaults to the
+                primary data; if it has no protocol_steps relationship, all
+                included steps are used.
+        """
+        protocol = protocol or self.data
+        steps = self.related(protocol, 'protocol_steps') if isinstance(protocol, dict) else None
+        if not steps:
+            steps = self.of_type('protocol_steps')
+        return sorted(steps, key=lambda step: step['attributes'].get('position') or 0)
+
+    def inventory_cells(self, item):
+        """Return the cells of an inventory item (requested with ?include=inventory_cells)."""
+        return self.related(item, 'inventory_cells') or []
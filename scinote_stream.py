@@ -0,0 +1,240 @@
+"""
+SciNote API Client - Streaming JSON:API Parser
+
+Parses a JSON:API document while it is being downloaded. The resources in
+the top-level `data` and `included` arrays are returned one by one as soon
+as each of them is complete, so the whole response is never held in memory.
+Other top-level members (`links`, `meta`, ...) are collected in `members`.
+
+Usually used through SciNoteSession.stream() or iter_resources(stream=True):
+
+    from scinote_api import get_default_session
+
+    stream = get_default_session().stream('/api/v1/teams/1/inventories/3/items?include=inventory_cells')
+    for member, resource in stream:
+        if member == 'data':
+            print(resource['attributes']['name'])
+    print(stream.members['links'].get('next'))
+"""
+
+import codecs
+import json
+import re
+import zlib
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER = re.compile(r'[-+0-9.eE]*')
+# Text without brackets outside strings, a bracket, or the opening quote of an incomplete string
+_TOKEN = re.compile(r'(?:"[^"\\]*(?:\\.[^"\\]*)*"|[^"{}\[\]])+|[{}\[\]]|"', re.DOTALL)
+_STREAMED_MEMBERS = ('data', 'included')
+
+
+class JSONAPIStream:
+    """
+    Iterates over the resources of a JSON:API document read from a file-like object.
+
+    Iterating yields (member, resource) tuples, where member is 'data' or
+    'included'. A single resource in `data` (detail endpoints) is yielded
+    the same way. After iteration, `members` holds all other top-level
+    members of the document.
+
+    Args:
+        reader: Object with a read(size) method returning bytes.
+        chunk_size (int): Number of bytes read at a time.
+        on_close (callable, optional): Called once reading is finished or the
+            iteration is stopped early (e.g. to release the connection).
+    """
+
+    def __init__(self, reader, chunk_size=64 * 1024, on_close=None):
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self.members = {}
+        self._on_close = on_close
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        try:
+            yield from self._parse_document()
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop reading and release the underlying connection."""
+        if self._on_close is not None:
+            on_close, self._on_close = self._on_close, None
+            on_close()
+
+    # --- Reading ---
+
+    def _read_more(self):
+        """Append the next chunk to the buffer. Returns False at the end of the input."""
+        if self._eof:
+            return False
+        chunk = self.reader.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            self._buffer += self._text_decoder.decode(b'', final=True)
+            return False
+        # Drop the part of the buffer that was already parsed
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(chunk)
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """Skip whitespace and return the next character ('' at the end of the input)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ''
+
+    def _expect(self, characters):
+        """Consume one of the expected characters and return it."""
+        char = self._peek()
+        if not char or char not in characters:
+            raise ValueError(
+                f"Invalid JSON:API document: expected {' or '.join(repr(c) for c in characters)}, "
+                f"found {char!r}"
+            )
+        self._pos += 1
+        return char
+
+    def _buffer_value(self):
+        """
+        Read input until the object, array or string starting at the current
+        position is completely buffered.
+
+        Scanning continues where it stopped when more input arrives, so a
+        value spanning many chunks is scanned once and then decoded once,
+        instead of being decoded again from its start for every chunk.
+        """
+        depth = 0
+        offset = 0    # Where to continue scanning, relative to self._pos
+        while True:
+            position = self._pos + offset
+            for match in _TOKEN.finditer(self._buffer, position):
+                token = match.group()
+                if token == '"':
+                    break    # String not complete yet - scan it again with more input
+                position = match.end()
+                if token in ('[', '{'):
+                    depth += 1
+                elif token in (']', '}'):
+                    depth -= 1
+                if depth == 0:
+                    return
+            else:
+                position = len(self._buffer)
+            offset = position - self._pos
+            if not self._read_more():
+                return    # Incomplete - decoding reports the error
+
+    def _decode_value(self):
+        """Decode the next complete JSON value, reading more input as needed."""
+        char = self._peek()
+        if char and char in '{["':
+            self._buffer_value()
+        elif char and char in '-0123456789':
+            # Numbers have no closing character - make sure the whole number is buffered
+            while (_NUMBER.match(self._buffer, self._pos).end() == len(self._buffer)
+                   and self._read_more()):
+                pass
+
+        while True:
+            try:
+                value, self._pos = self._decoder.raw_decode(self._buffer, self._pos)
+                return value
+            except json.JSONDecodeError:
+                # Only literals (true, false, null) can still be incomplete here
+                if not self._read_more():
+                    raise
+
+    # --- Parsing ---
+
+    def _parse_document(self):
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key = self._decode_value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid JSON:API document: member names must be strings")
+            self._expect(':')
+
+            if key in _STREAMED_MEMBERS and self._peek() == '[':
+                self._pos += 1
+                yield from self._parse_array(key)
+            elif key in _STREAMED_MEMBERS and self._peek() == '{':
+                yield key, self._decode_value()
+            else:
+                self.members[key] = self._decode_value()
+
+            if self._expect(',}') == '}':
+                return
+
+    def _parse_array(self, key):
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield key, self._decode_value()
+            if self._expect(',]') == ']':
+                return
+
+
+class DecompressingReader:
+    """Wraps a reader of gzip or deflate encoded bytes and returns decoded bytes."""
+
+    def __init__(self, reader, encoding):
+        self.reader = reader
+        self.encoding = encoding
+        self._decompressor = None
+        self._head = b''        # First bytes, until the zlib header can be checked
+        self._fed = None        # Input so far, while a zlib header may turn out to be wrong
+
+    def read(self, size=-1):
+        while True:
+            chunk = self.reader.read(size)
+            eof = not chunk
+            if self._decompressor is None:
+                self._head += chunk
+                if not eof and len(self._head) < 2:
+                    continue
+                chunk, self._head = self._head, b''
+                self._start(chunk)
+            data = self._decompress(chunk)
+            if eof:
+                return data + self._decompressor.flush()
+            if data:
+                return data
+
+    def _start(self, head):
+        if self.encoding in ('gzip', 'x-gzip'):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif (len(head) >= 2 and head[0] & 0x0f == 8
+                and (head[0] * 256 + head[1]) % 31 == 0):
+            # Deflate data may come with or without the zlib header
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+            self._fed = b''
+        else:
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    def _decompress(self, chunk):
+        try:
+            data = self._decompressor.decompress(chunk)
+        except zlib.error:
+            if self._fed is None:
+                raise
+            # Raw deflate data that happened to look like a zlib header -
+            # start over without it, like _decompress_body() does
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            chunk, self._fed = self._fed + chunk, None
+            return self._decompressor.decompress(chunk)
+        if self._fed is not None:
+            self._fed = None if data else self._fed + chunk
+        return data
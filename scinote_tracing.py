@@ -0,0 +1,264 @@
+"""
+SciNote API Client - Request Tracing
+
+Records how long each part of a script takes as nested spans. Every API
+request becomes a span automatically; scripts can add their own spans for
+logical steps (e.g. "experiment 12"), and the requests made inside such a
+step become its children. The result can be saved as a Chrome trace-event
+file and opened in a trace viewer (chrome://tracing or https://ui.perfetto.dev)
+to see which part of a long export was slow.
+
+Usage:
+    from scinote_tracing import enable_tracing, span
+
+    enable_tracing('export_trace.json')
+
+    for experiment in experiments:
+        with span(f"experiment {experiment['id']}"):
+            ...  # api_request() calls
+
+    # The trace is written when the script exits.
+
+span() does nothing while tracing is not enabled, so it can stay in scripts.
+"""
+
+import asyncio
+import atexit
+import contextvars
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from scinote_api import RequestHook, get_default_session
+from scinote_metrics import endpoint_template
+
+_current_span = contextvars.ContextVar('scinote_current_span', default=None)
+_active_tracer = None
+
+
+class Span:
+    """One timed operation. Times are in seconds since the epoch."""
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'start', 'duration', 'lane', 'attributes')
+
+    def __init__(self, name, span_id, parent_id, start, lane, attributes):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start = start
+        self.duration = None
+        self.lane = lane
+        self.attributes = attributes
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': self.start,
+            'duration': self.duration,
+            'lane': self.lane,
+            'attributes': self.attributes,
+        }
+
+
+class Tracer(RequestHook):
+    """
+    Collects spans of a script.
+
+    Register it as a hook of a session to record a span for every request
+    attempt, token refresh and retry wait. Spans opened with span() are
+    parents of the spans started inside them, also across asyncio tasks and
+    prefetch threads started from within them.
+
+    Args:
+        max_spans (int): Maximum number of spans kept. Further spans are
+            counted in `dropped` but not stored.
+    """
+
+    def __init__(self, max_spans=100000):
+        self.max_spans = max_spans
+        self.dropped = 0
+        self._spans = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._lanes = {}   # (thread, asyncio task) -> (lane number, name)
+        # Wall clock time at a perf_counter reference, for precise timestamps
+        self._wall_origin = time.time()
+        self._perf_origin = time.perf_counter()
+
+    def _now(self):
+        return self._wall_origin + (time.perf_counter() - self._perf_origin)
+
+    def _lane(self):
+        """Number of the thread or asyncio task the caller runs in."""
+        thread = threading.current_thread()
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = (thread.ident, id(task) if task is not None else None)
+        with self._lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                name = f'{thread.name} / {task.get_name()}' if task is not None else thread.name
+                lane = self._lanes[key] = (len(self._lanes) + 1, name)
+        return lane[0]
+
+    def _record(self, span):
+        with self._lock:
+            if len(self._spans) < self.max_spans:
+                self._spans.append(span)
+            else:
+                self.dropped += 1
+
+    def _new_span(self, name, start, attributes):
+        parent = _current_span.get()
+        return Span(name, next(self._ids), parent.span_id if parent else None,
+                    start, self._lane(), attributes)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """
+        Time a block of code as a span; spans started inside become its children.
+
+        Yields:
+            Span: The span, e.g. to add attributes while it runs
+        """
+        span = self._new_span(name, self._now(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes['error'] = f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            _current_span.reset(token)
+            span.duration = self._now() - span.start
+            self._record(span)
+
+    def _record_finished(self, name, duration, attributes):
+        span = self._new_span(name, self._now() - duration, attributes)
+        span.duration = duration
+        self._record(span)
+
+    # --- Hook methods ---
+
+    def after_request(self, method, endpoint, attempt, duration, status,
+                      bytes_sent, bytes_received, error):
+        attributes = {'endpoint': endpoint, 'status': status, 'attempt': attempt,
+                      'bytes_sent': bytes_sent, 'bytes_received': bytes_received}
+        if error is not None:
+            attributes['error'] = str(error)
+        self._record_finished(f'{method.upper()} {endpoint_template(endpoint)}',
+                              duration, attributes)
+
+    def on_retry(self, method, endpoint, attempt, delay, status, error):
+        # The wait follows now - record it as a span ending after the delay
+        span = self._new_span('retry wait', self._now(),
+                              {'endpoint': endpoint, 'attempt': attempt, 'status': status})
+        span.duration = delay
+        self._record(span)
+
+    def on_token_refresh(self, duration):
+        self._record_finished('token refresh', duration, {})
+
+    # --- Output ---
+
+    def spans(self):
+        """Return the finished spans, ordered by start time."""
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span.start)
+
+    def to_json(self):
+        """Return the spans as a JSON list (times in seconds)."""
+        return json.dumps([span.to_dict() for span in self.spans()], indent=2, default=str)
+
+    def to_chrome_trace(self):
+        """Return the spans in the Chrome trace-event format (as a dict)."""
+        spans = self.spans()
+        origin = spans[0].start if spans else self._wall_origin
+        events = [
+            {
+                'name': span.name,
+                'cat': 'api' if 'endpoint' in span.attributes else 'script',
+                'ph': 'X',
+                'ts': round((span.start - origin) * 1e6, 1),
+                'dur': round(span.duration * 1e6, 1),
+                'pid': 1,
+                'tid': span.lane,
+                'args': dict(span.attributes, span_id=span.span_id, parent_id=span.parent_id),
+            }
+            for span in spans
+        ]
+        with self._lock:
+            lanes = list(self._lanes.values())
+        events.extend({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': lane,
+                       'args': {'name': name}} for lane, name in lanes)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'started_at': origin, 'dropped_spans': self.dropped}}
+
+    def dump(self, path, format='chrome'):
+        """
+        Write the trace to a file.
+
+        Args:
+            path (str or Path): Output file
+            format (str): 'chrome' (trace-event file for chrome://tracing or
+                Perfetto) or 'json' (plain list of spans)
+        """
+        if format not in ('chrome', 'json'):
+            raise ValueError(f"Unknown trace format '{format}'.\n"
+                             f"→ Use 'chrome' or 'json'")
+        with open(path, 'w', encoding='utf-8') as f:
+            if format == 'chrome':
+                json.dump(self.to_chrome_trace(), f, default=str)
+            else:
+                f.write(self.to_json())
+
+    def dump_at_exit(self, path, format='chrome'):
+        """Write the trace to a file when the script exits (see dump())."""
+        atexit.register(self.dump, path, format)
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time a logical step of a script with the tracer enabled by enable_tracing().
+
+    Does nothing if tracing is not enabled.
+
+    Example:
+        with span(f"experiment {exp_id}", tasks=len(tasks)):
+            ...
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, **attributes) as current:
+        yield current
+
+
+def enable_tracing(path=None, format='chrome', session=None):
+    """
+    Trace all requests of a session (the default session of api_request()
+    unless given) and the spans opened with span().
+
+    Args:
+        path (str or Path, optional): Write the trace to this file at exit
+        format (str): 'chrome' or 'json' (see Tracer.dump())
+        session (SciNoteSession, optional): Session to trace
+
+    Returns:
+        Tracer: The tracer
+    """
+    global _active_tracer
+    tracer = Tracer()
+    (session or get_default_session()).add_hook(tracer)
+    _active_tracer = tracer
+    if path is not None:
+        tracer.dump_at_exit(path, format)
+    return tracer
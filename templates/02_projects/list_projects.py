@@ -48,20 +48,20 @@ else:
     print("Make sure you're running this script from within the repository directory.")
     sys.exit(1)
 
-from scinote_api import api_request
+from scinote_api import iter_resources
 # ============================================================================
 
 
-# Make the API request
-response = api_request('GET', f'/api/v1/teams/{TEAM_ID}/projects')
+# Make the API request (fetches all pages)
+projects = list(iter_resources(f'/api/v1/teams/{TEAM_ID}/projects'))
 
 # Display results
 print(f"\n{'='*70}")
 print(f"Projects in Team {TEAM_ID}")
-print(f"Found {len(response['data'])} project(s)")
+print(f"Found {len(projects)} project(s)")
 print(f"{'='*70}\n")
 
-for project in response['data']:
+for project in projects:
     project_id = project['id']
     attrs = project['attributes']
     name = attrs.get('name', 'N/A')
@@ -50,22 +50,22 @@ else:
     print("Make sure you're running this script from within the repository directory.")
     sys.exit(1)
 
-from scinote_api import api_request
+from scinote_api import iter_resources
 # ============================================================================
 
 
-# Make the API request
-response = api_request(
-    "GET", f"/api/v1/teams/{TEAM_ID}/projects/{PROJECT_ID}/experiments"
+# Make the API request (fetches all pages)
+experiments = list(
+    iter_resources(f"/api/v1/teams/{TEAM_ID}/projects/{PROJECT_ID}/experiments")
 )
 
 # Display results
 print(f"\n{'=' * 70}")
 print(f"Experiments in Project {PROJECT_ID}")
-print(f"Found {len(response['data'])} experiment(s)")
+print(f"Found {len(experiments)} experiment(s)")
 print(f"{'=' * 70}\n")
 
-for experiment in response["data"]:
+for experiment in experiments:
     exp_id = experiment["id"]
     attrs = experiment["attributes"]
     name = attrs.get("name", "N/A")
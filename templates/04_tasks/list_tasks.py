@@ -51,23 +51,23 @@ else:
     print("Make sure you're running this script from within the repository directory.")
     sys.exit(1)
 
-from scinote_api import api_request
+from scinote_api import iter_resources
 # ============================================================================
 
 
-# Make the API request
+# Make the API request (fetches all pages)
 endpoint = (
     f"/api/v1/teams/{TEAM_ID}/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/tasks"
 )
-response = api_request("GET", endpoint)
+tasks = list(iter_resources(endpoint))
 
 # Display results
 print(f"\n{'=' * 70}")
 print(f"Tasks in Experiment {EXPERIMENT_ID}")
-print(f"Found {len(response['data'])} task(s)")
+print(f"Found {len(tasks)} task(s)")
 print(f"{'=' * 70}\n")
 
-for task in response["data"]:
+for task in tasks:
     task_id = task["id"]
     attrs = task["attributes"]
     name = attrs.get("name", "N/A")
@@ -55,6 +55,7 @@ else:
     sys.exit(1)
 
 from scinote_api import api_request
+from scinote_models import Document
 # ============================================================================
 
 
@@ -62,9 +63,10 @@ from scinote_api import api_request
 # Note: Use ?include=protocol_steps to get steps in the response
 endpoint = f'/api/v1/teams/{TEAM_ID}/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/tasks/{TASK_ID}/protocols/{PROTOCOL_ID}?include=protocol_steps'
 response = api_request('GET', endpoint)
+document = Document(response)
 
 # Display protocol details
-protocol = response["data"]
+protocol = document.data
 attrs = protocol["attributes"]
 
 print(f"\n{'=' * 70}")
@@ -81,12 +83,12 @@ print(f"Protocol Steps")
 print(f"{'=' * 70}\n")
 
 if "included" in response:
-    steps = [item for item in response["included"] if item["type"] == "protocol_steps"]
+    steps = document.protocol_steps()
 
     if steps:
         print(f"Found {len(steps)} step(s):\n")
 
-        for step in sorted(steps, key=lambda s: s["attributes"].get("position", 0)):
+        for step in steps:
             step_id = step["id"]
             step_attrs = step["attributes"]
             position = step_attrs.get("position", "N/A")
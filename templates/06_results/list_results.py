@@ -52,21 +52,21 @@ else:
     print("Make sure you're running this script from within the repository directory.")
     sys.exit(1)
 
-from scinote_api import api_request
+from scinote_api import iter_resources
 # ============================================================================
 
 
-# Make the API request
+# Make the API request (fetches all pages)
 endpoint = f"/api/v1/teams/{TEAM_ID}/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/tasks/{TASK_ID}/results"
-response = api_request("GET", endpoint)
+results = list(iter_resources(endpoint))
 
 # Display results
 print(f"\n{'=' * 70}")
 print(f"Results for Task {TASK_ID}")
-print(f"Found {len(response['data'])} result(s)")
+print(f"Found {len(results)} result(s)")
 print(f"{'=' * 70}\n")
 
-for result in response["data"]:
+for result in results:
     result_id = result["id"]
     attrs = result["attributes"]
     name = attrs.get("name", "N/A")
@@ -8,8 +8,9 @@ API Endpoint: GET /api/v1/teams/{team_id}/inventories/{inventory_id}/items
 # ===== CONFIGURATION =====
 TEAM_ID = 2  # Your team ID
 INVENTORY_ID = 1  # Your inventory ID
-PAGE_SIZE = 25  # Number of items per page (optional, max 100)
-PAGE_NUMBER = 1  # Which page to retrieve (starts at 1)
+PAGE_SIZE = 100  # Number of items fetched per request (max 100)
+PREFETCH_PAGES = 4  # Pages fetched in parallel for large inventories (0 = one at a time)
+FIELDS = ["name", "created_at"]  # Attributes to download (None = all attributes)
 # =========================
 
 
@@ -52,23 +53,28 @@ else:
     print("Make sure you're running this script from within the repository directory.")
     sys.exit(1)
 
-from scinote_api import api_request
+from scinote_api import build_endpoint, get_default_session, iter_resources
 # ============================================================================
 
 
 # Make the API request
-# Note: Pagination is done via query parameters in the URL
-# Use links.next from response to get subsequent pages
-endpoint = f"/api/v1/teams/{TEAM_ID}/inventories/{INVENTORY_ID}/items?page[size]={PAGE_SIZE}&page[number]={PAGE_NUMBER}"
-response = api_request("GET", endpoint)
+# Note: Items are fetched page by page - iter_resources() follows the
+# links.next URL of each response until all items are retrieved.
+# With PREFETCH_PAGES, the next pages are downloaded while items are printed.
+# FIELDS asks the server only for the attributes printed below (sparse
+# fieldsets), which makes the responses much smaller.
+endpoint = f"/api/v1/teams/{TEAM_ID}/inventories/{INVENTORY_ID}/items"
+if FIELDS:
+    endpoint = build_endpoint(endpoint, fields={"inventory_items": FIELDS})
+transfer_before = get_default_session().transfer_stats.snapshot()
 
 # Display results
 print(f"\n{'=' * 70}")
 print(f"Items in Inventory {INVENTORY_ID}")
-print(f"Found {len(response['data'])} item(s)")
 print(f"{'=' * 70}\n")
 
-for item in response["data"]:
+item_count = 0
+for item in iter_resources(endpoint, page_size=PAGE_SIZE, prefetch=PREFETCH_PAGES):
     item_id = item["id"]
     attrs = item["attributes"]
     name = attrs.get("name", "N/A")
@@ -78,14 +84,12 @@ for item in response["data"]:
     print(f"  Name: {name}")
     print(f"  Created: {created}")
     print()
+    item_count += 1
 
 print(f"{'=' * 70}")
+print(f"\n✓ Found {item_count} item(s) (all pages retrieved).")
 
-# Check if there are more pages
-if "links" in response and "next" in response["links"] and response["links"]["next"]:
-    print(
-        f"\n💡 There are more items. To get the next page, set PAGE_NUMBER = {PAGE_NUMBER + 1}"
-    )
-    print(f"   Or use the next link: {response['links']['next']}\n")
-else:
-    print(f"\n✓ All items retrieved (no more pages).\n")
+transfer = get_default_session().transfer_stats.snapshot()
+received = transfer["bytes_received"] - transfer_before["bytes_received"]
+received_wire = transfer["bytes_received_wire"] - transfer_before["bytes_received_wire"]
+print(f"  Downloaded {received_wire / 1024:.1f} KB ({received / 1024:.1f} KB of JSON).\n")
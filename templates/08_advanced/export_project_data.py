@@ -1,6 +1,7 @@
 """
 Template: Export Project Data
-Description: Exports complete project structure including experiments, tasks, and results
+Description: Exports complete project structure including experiments, tasks, and results.
+             Each level is fetched with parallel requests (see scinote_export.py).
 Prerequisites: Valid API credentials, Team ID, Project ID
 API Endpoints: Multiple (hierarchical data retrieval)
 """
@@ -10,6 +11,13 @@ TEAM_ID = 1
 PROJECT_ID = 1
 OUTPUT_FILE = "project_export.json"  # Output file name
 INCLUDE_RESULTS = True  # Whether to fetch results for each task
+WORKERS = 8  # Maximum number of requests running at the same time
+INCREMENTAL = False  # Only fetch results of tasks changed since the last export
+STATE_FILE = "project_export.state.json"  # Used by INCREMENTAL exports
+# Changes to results don't always change their task, so incremental exports
+# don't see them. A full export every few days picks them up.
+FULL_EXPORT_EVERY_DAYS = 7
+TRACE_FILE = None  # e.g. "export_trace.json" to record timings (open in chrome://tracing)
 # =========================
 
 
@@ -23,6 +31,7 @@ INCLUDE_RESULTS = True  # Whether to fetch results for each task
 
 import sys
 import json
+import os
 from pathlib import Path
 
 
@@ -53,103 +62,63 @@ else:
     print("Make sure you're running this script from within the repository directory.")
     sys.exit(1)
 
-from scinote_api import api_request
+from scinote_export import ExportState, ProjectExporter
+from scinote_tracing import enable_tracing
 # ============================================================================
 
 
+if TRACE_FILE:
+    enable_tracing(TRACE_FILE)
+
 print(f"\n{'=' * 70}")
 print(f"Exporting Project {PROJECT_ID}")
 print(f"{'=' * 70}\n")
 
-# Step 1: Get project details
-print("1. Fetching project details...")
-project_response = api_request("GET", f"/api/v1/teams/{TEAM_ID}/projects/{PROJECT_ID}")
-project = project_response["data"]
-project_data = {
-    "id": project["id"],
-    "name": project["attributes"].get("name", "N/A"),
-    "description": project["attributes"].get("description", ""),
-    "visibility": project["attributes"].get("visibility", "N/A"),
-    "experiments": [],
-}
-print(f"   ✓ Project: {project_data['name']}")
-
-# Step 2: Get all experiments in project
-print("2. Fetching experiments...")
-experiments_response = api_request(
-    "GET", f"/api/v1/teams/{TEAM_ID}/projects/{PROJECT_ID}/experiments"
+# Steps 1-4: Fetch project, experiments, tasks and results, each level in parallel
+print(f"1. Fetching project data ({WORKERS} parallel requests)...")
+state = previous = None
+if INCREMENTAL:
+    state = ExportState.load(STATE_FILE)
+    if os.path.exists(OUTPUT_FILE):
+        with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+exporter = ProjectExporter(
+    TEAM_ID,
+    PROJECT_ID,
+    include_results=INCLUDE_RESULTS,
+    workers=WORKERS,
+    state=state,
+    previous=previous,
+    full_export_every=FULL_EXPORT_EVERY_DAYS * 24 * 3600,
 )
-experiments = experiments_response["data"]
-print(f"   ✓ Found {len(experiments)} experiment(s)")
-
-# Step 3: For each experiment, get tasks
-for exp in experiments:
-    exp_id = exp["id"]
-    exp_attrs = exp["attributes"]
-
-    experiment_data = {
-        "id": exp_id,
-        "name": exp_attrs.get("name", "N/A"),
-        "description": exp_attrs.get("description", ""),
-        "status": exp_attrs.get("status", "N/A"),
-        "tasks": [],
-    }
-
-    print(f"\n   Experiment {exp_id}: {experiment_data['name']}")
-    print(f"   ├─ Fetching tasks...")
-
-    # Get tasks for this experiment
-    tasks_response = api_request(
-        "GET",
-        f"/api/v1/teams/{TEAM_ID}/projects/{PROJECT_ID}/experiments/{exp_id}/tasks",
-    )
-    tasks = tasks_response["data"]
-    print(f"   │  ✓ Found {len(tasks)} task(s)")
-
-    # Step 4: For each task, optionally get results
-    for task in tasks:
-        task_id = task["id"]
-        task_attrs = task["attributes"]
-
-        task_data = {
-            "id": task_id,
-            "name": task_attrs.get("name", "N/A"),
-            "description": task_attrs.get("description", ""),
-            "state": task_attrs.get("state", "N/A"),
-            "status_name": task_attrs.get("status_name", "N/A"),
-        }
-
-        # Optionally fetch results
-        if INCLUDE_RESULTS:
-            try:
-                results_response = api_request(
-                    "GET",
-                    f"/api/v1/teams/{TEAM_ID}/projects/{PROJECT_ID}/experiments/{exp_id}/tasks/{task_id}/results",
-                )
-                results = results_response["data"]
-
-                task_data["results"] = [
-                    {
-                        "id": r["id"],
-                        "name": r["attributes"].get("name", "N/A"),
-                        "created_at": r["attributes"].get("created_at", "N/A"),
-                    }
-                    for r in results
-                ]
-                print(
-                    f"   │  ├─ Task {task_id}: {task_data['name']} ({len(results)} results)"
-                )
-            except Exception as e:
-                print(
-                    f"   │  ├─ Task {task_id}: {task_data['name']} (error fetching results)"
-                )
-                task_data["results"] = []
+project_data = exporter.export()
+print(f"   ✓ Project: {project_data['name']}")
+if INCREMENTAL and exporter.full_export:
+    print(f"   ✓ Full export (next one in {FULL_EXPORT_EVERY_DAYS} days)")
+elif INCREMENTAL:
+    print(f"   ✓ Reused results of {exporter.reused} unchanged task(s) from {OUTPUT_FILE}")
+print(f"   ✓ Found {len(project_data['experiments'])} experiment(s)")
+
+for experiment_data in project_data["experiments"]:
+    print(f"\n   Experiment {experiment_data['id']}: {experiment_data['name']}")
+    print(f"   │  ✓ Found {len(experiment_data['tasks'])} task(s)")
+    for task_data in experiment_data["tasks"]:
+        if not INCLUDE_RESULTS:
+            print(f"   │  ├─ Task {task_data['id']}: {task_data['name']}")
+        elif task_data["id"] in exporter.errors:
+            print(f"   │  ├─ Task {task_data['id']}: {task_data['name']} (error fetching results)")
         else:
-            print(f"   │  ├─ Task {task_id}: {task_data['name']}")
-
-        experiment_data["tasks"].append(task_data)
-
-    project_data["experiments"].append(experiment_data)
+            print(
+                f"   │  ├─ Task {task_data['id']}: {task_data['name']} "
+                f"({len(task_data['results'])} results)"
+            )
+
+print(f"\n2. Timings:")
+for level, timing in exporter.timings.items():
+    print(
+        f"   {level:<12} {timing['requests']:>6} request(s) {timing['seconds']:>8.2f}s"
+    )
 
 # Step 5: Save to JSON file
 print(f"\n3. Saving to {OUTPUT_FILE}...")
@@ -158,6 +127,10 @@ with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
 
 print(f"   ✓ Export saved")
 
+if INCREMENTAL:
+    # Saved after the export, so it always describes the file on disk
+    state.save(STATE_FILE)
+
 # Summary
 print(f"\n{'=' * 70}")
 print(f"Export Complete!")